@@ -0,0 +1,94 @@
+"""
+Scalping Strategy Kernel
+Compiled setup validation, targets and Chandelier exit for the scalping strategy
+"""
+
+import math
+from typing import Dict
+
+from .jit import njit
+
+# atan is monotone, so "slope angle > 30 degrees" is "normalized slope > tan(30 degrees)"
+_TAN_30 = math.tan(math.radians(30))
+
+# Bit order of the confirmation mask returned by scalp_core
+SCALP_INDICATORS = ('vwap_slope', 'volume_spike', 'rsi_filter', 'ema_confirmation', 'momentum_filter')
+
+
+@njit(cache=True)
+def scalp_core(close, volume, vwap, rsi, ema9, ema21):
+    """Validate a scalping setup.
+
+    Returns (is_valid, indicator bitmask, normalized vwap slope, entry at the last close).
+    The slope is in percent of the last close per bar; its angle is atan of that value.
+    """
+    n = close.shape[0]
+    mask = 0
+    confirmations = 0
+
+    # 1. VWAP slope > 30 degrees (closed-form least-squares slope over the last 20 bars)
+    normalized_slope = 0.0
+    if n >= 20 and not math.isnan(vwap[n - 20]):
+        y_mean = vwap[n - 20:].mean()
+        numerator = 0.0
+        denominator = 0.0
+        for i in range(20):
+            dx = i - 9.5
+            numerator += dx * (vwap[n - 20 + i] - y_mean)
+            denominator += dx * dx
+        normalized_slope = numerator / denominator / close[n - 1] * 100
+        if normalized_slope > _TAN_30:
+            mask |= 1
+            confirmations += 1
+
+    # 2. Volume spike > 1.5x the previous 9-bar average
+    if n >= 10:
+        avg_volume = volume[n - 10:n - 1].mean()
+        if volume[n - 1] > avg_volume * 1.5:
+            mask |= 2
+            confirmations += 1
+
+    # 3. RSI in optimal range (40-60); a NaN warm-up value fails both bounds
+    if n > 0 and 40 <= rsi[n - 1] <= 60:
+        mask |= 4
+        confirmations += 1
+
+    # 4. EMA 9/21 golden or death cross on the last bar, once both EMAs are defined on the previous bar
+    if n >= 2 and not (math.isnan(ema9[n - 2]) or math.isnan(ema21[n - 2])):
+        if ((ema9[n - 1] > ema21[n - 1] and ema9[n - 2] <= ema21[n - 2]) or
+                (ema9[n - 1] < ema21[n - 1] and ema9[n - 2] >= ema21[n - 2])):
+            mask |= 8
+            confirmations += 1
+
+    # 5. Momentum: price change > 0.2% over the last 3 bars
+    if n >= 3:
+        price_change = (close[n - 1] - close[n - 3]) / close[n - 3] * 100
+        if abs(price_change) > 0.2:
+            mask |= 16
+            confirmations += 1
+
+    entry = close[n - 1] if n > 0 else 0.0
+
+    # At least 4 out of 5 confirmations required for scalping
+    return confirmations >= 4, mask, normalized_slope, entry
+
+
+@njit(cache=True)
+def scalp_targets(entry, is_long):
+    """SL at 0.3% and TP1/TP2/TP3 at 0.5% / 1.0% / 1.5% from entry"""
+    direction = 1.0 if is_long else -1.0
+    return (entry - direction * entry * 0.003,
+            entry + direction * entry * 0.005,
+            entry + direction * entry * 0.01,
+            entry + direction * entry * 0.015)
+
+
+@njit(cache=True)
+def chandelier_exit(high, atr, period, multiplier):
+    """Highest high over the last `period` bars less multiplier x ATR"""
+    return high[high.shape[0] - period:].max() - atr * multiplier
+
+
+def indicators_from_mask(mask: int) -> Dict[str, bool]:
+    """Expand a scalp_core bitmask into the named confirmation flags"""
+    return {name: bool(mask & (1 << bit)) for bit, name in enumerate(SCALP_INDICATORS)}
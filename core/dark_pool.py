@@ -34,7 +34,7 @@ class DarkPoolDetector:
         """Fetch order book data (public method)"""
         try:
             order_book = self.exchange.fetch_order_book(symbol, limit=limit)
-            return dict(order_book) if order_book is not None else None
+            return order_book if isinstance(order_book, dict) else None
         except Exception as e:
             print(f"Error fetching order book for {symbol}: {e}")
             return None
@@ -43,7 +43,7 @@ class DarkPoolDetector:
         """Fetch recent trades (public method)"""
         try:
             trades = self.exchange.fetch_trades(symbol, limit=limit)
-            return [dict(trade) for trade in trades] if trades is not None else None
+            return trades if isinstance(trades, list) else None
         except Exception as e:
             print(f"Error fetching trades for {symbol}: {e}")
             return None
@@ -5,9 +5,23 @@ Uses free CCXT data for comprehensive technical analysis
 
 import math
 import ccxt
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 
+from .jit import njit
+
+@njit(cache=True)
+def _ema(prices, period):
+    """EMA seeded with the SMA of the first period, updated for every later price"""
+    multiplier = 2.0 / (period + 1)
+    ema_values = np.empty(prices.shape[0])
+    ema_values[0] = prices[:period].sum() / period
+    for i in range(1, prices.shape[0]):
+        ema_values[i] = prices[i] * multiplier + ema_values[i - 1] * (1 - multiplier)
+    return ema_values
+
 class TechnicalIndicators:
     def __init__(self):
         # Initialize CCXT with public access (no auth required)
@@ -31,23 +45,14 @@ class TechnicalIndicators:
             print(f"Error fetching OHLCV data for {symbol}: {e}")
             return None
 
-    def calculate_ema(self, prices: List[float], period: int) -> List[float]:
+    def calculate_ema(self, prices: np.ndarray, period: int) -> np.ndarray:
         """Calculate Exponential Moving Average"""
+        prices = np.asarray(prices, dtype=np.float64)
         if len(prices) < period:
             return prices
         
-        ema_values = []
-        multiplier = 2 / (period + 1)
-        
-        # First EMA is SMA
-        sma = sum(prices[:period]) / period
-        ema_values.append(sma)
-        
-        for i in range(1, len(prices)):
-            ema = (prices[i] * multiplier) + (ema_values[-1] * (1 - multiplier))
-            ema_values.append(ema)
-        
-        return ema_values
+        # First EMA is SMA, then the recursive update runs in the compiled kernel
+        return _ema(prices, period)
 
     def calculate_sma(self, prices: List[float], period: int) -> List[float]:
         """Calculate Simple Moving Average"""
@@ -61,32 +66,16 @@ class TechnicalIndicators:
         
         return sma_values
 
-    def calculate_macd(self, prices: List[float], fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, List[float]]:
+    def calculate_macd(self, prices: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, np.ndarray]:
         """Calculate MACD (Moving Average Convergence Divergence)"""
+        prices = np.asarray(prices, dtype=np.float64)
         if len(prices) < slow:
-            return {'macd': [], 'signal': [], 'histogram': []}
-        
-        ema_fast = self.calculate_ema(prices, fast)
-        ema_slow = self.calculate_ema(prices, slow)
-        
-        # Calculate MACD line
-        macd_line = []
-        for i in range(len(ema_slow)):
-            if i < len(ema_fast):
-                macd_line.append(ema_fast[i] - ema_slow[i])
-            else:
-                macd_line.append(0)
+            return {'macd': np.empty(0), 'signal': np.empty(0), 'histogram': np.empty(0)}
         
-        # Calculate signal line
+        # Both EMAs span the full price series, so the lines align element-wise
+        macd_line = self.calculate_ema(prices, fast) - self.calculate_ema(prices, slow)
         signal_line = self.calculate_ema(macd_line, signal)
-        
-        # Calculate histogram
-        histogram = []
-        for i in range(len(signal_line)):
-            if i < len(macd_line):
-                histogram.append(macd_line[i] - signal_line[i])
-            else:
-                histogram.append(0)
+        histogram = macd_line - signal_line
         
         return {
             'macd': macd_line,
@@ -94,86 +83,48 @@ class TechnicalIndicators:
             'histogram': histogram
         }
 
-    def calculate_rsi(self, prices: List[float], period: int = 14) -> List[float]:
+    def calculate_rsi(self, prices: np.ndarray, period: int = 14) -> np.ndarray:
         """Calculate Relative Strength Index"""
         if len(prices) < period + 1:
-            return []
+            return np.empty(0)
         
-        gains = []
-        losses = []
-        
-        for i in range(1, len(prices)):
-            change = prices[i] - prices[i-1]
-            if change > 0:
-                gains.append(change)
-                losses.append(0)
-            else:
-                gains.append(0)
-                losses.append(abs(change))
+        # Split changes into gain/loss arrays in one vectorized pass
+        diff = np.diff(np.asarray(prices, dtype=np.float64))
+        gains = np.where(diff > 0, diff, 0.0)
+        losses = np.where(diff < 0, -diff, 0.0)
         
-        rsi_values = []
-        for i in range(period, len(prices)):
-            avg_gain = sum(gains[i-period:i]) / period
-            avg_loss = sum(losses[i-period:i]) / period
-            
-            if avg_loss == 0:
-                rsi = 100
-            else:
-                rs = avg_gain / avg_loss
-                rsi = 100 - (100 / (1 + rs))
-            
-            rsi_values.append(rsi)
+        avg_gain = sliding_window_view(gains, period).mean(axis=1)
+        avg_loss = sliding_window_view(losses, period).mean(axis=1)
         
-        return rsi_values
+        rs = np.divide(avg_gain, avg_loss, out=np.zeros_like(avg_gain), where=avg_loss != 0)
+        return np.where(avg_loss == 0, 100.0, 100 - (100 / (1 + rs)))
 
-    def calculate_vwap(self, ohlcv_data: List[List[float]]) -> List[float]:
+    def calculate_vwap(self, ohlcv_data: np.ndarray) -> np.ndarray:
         """Calculate Volume Weighted Average Price"""
-        if not ohlcv_data:
-            return []
+        ohlcv = np.asarray(ohlcv_data, dtype=np.float64)
+        if len(ohlcv) == 0:
+            return np.empty(0)
         
-        vwap_values = []
-        cumulative_tp_volume = 0
-        cumulative_volume = 0
+        typical_price = (ohlcv[:, 2] + ohlcv[:, 3] + ohlcv[:, 4]) / 3
+        cumulative_tp_volume = np.cumsum(typical_price * ohlcv[:, 5])
+        cumulative_volume = np.cumsum(ohlcv[:, 5])
         
-        for candle in ohlcv_data:
-            high, low, close, volume = candle[2], candle[3], candle[4], candle[5]
-            typical_price = (high + low + close) / 3
-            tp_volume = typical_price * volume
-            
-            cumulative_tp_volume += tp_volume
-            cumulative_volume += volume
-            
-            if cumulative_volume > 0:
-                vwap = cumulative_tp_volume / cumulative_volume
-                vwap_values.append(vwap)
-            else:
-                vwap_values.append(typical_price)
-        
-        return vwap_values
+        # Bars before any volume fall back to the typical price
+        return np.divide(cumulative_tp_volume, cumulative_volume,
+                         out=typical_price.copy(), where=cumulative_volume > 0)
 
-    def calculate_atr(self, ohlcv_data: List[List[float]], period: int = 14) -> List[float]:
+    def calculate_atr(self, ohlcv_data: np.ndarray, period: int = 14) -> np.ndarray:
         """Calculate Average True Range"""
-        if len(ohlcv_data) < period + 1:
-            return []
-        
-        true_ranges = []
-        for i in range(1, len(ohlcv_data)):
-            high = ohlcv_data[i][2]
-            low = ohlcv_data[i][3]
-            prev_close = ohlcv_data[i-1][4]
-            
-            tr1 = high - low
-            tr2 = abs(high - prev_close)
-            tr3 = abs(low - prev_close)
-            true_range = max(tr1, tr2, tr3)
-            true_ranges.append(true_range)
-        
-        atr_values = []
-        for i in range(period - 1, len(true_ranges)):
-            atr = sum(true_ranges[i-period+1:i+1]) / period
-            atr_values.append(atr)
-        
-        return atr_values
+        ohlcv = np.asarray(ohlcv_data, dtype=np.float64)
+        if len(ohlcv) < period + 1:
+            return np.empty(0)
+        
+        high = ohlcv[1:, 2]
+        low = ohlcv[1:, 3]
+        prev_close = ohlcv[:-1, 4]
+        true_ranges = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+        
+        return sliding_window_view(true_ranges, period).mean(axis=1)
 
     def calculate_bollinger_bands(self, prices: List[float], period: int = 20, std_dev: float = 2) -> Dict[str, List[float]]:
         """Calculate Bollinger Bands"""
@@ -235,66 +186,39 @@ class TechnicalIndicators:
             'd': d_values
         }
 
-    def calculate_adx(self, ohlcv_data: List[List[float]], period: int = 14) -> List[float]:
+    def calculate_adx(self, ohlcv_data: np.ndarray, period: int = 14) -> np.ndarray:
         """Calculate Average Directional Index"""
-        if len(ohlcv_data) < period + 1:
-            return []
-        
-        # Calculate +DM and -DM
-        plus_dm = []
-        minus_dm = []
-        true_ranges = []
-        
-        for i in range(1, len(ohlcv_data)):
-            high = ohlcv_data[i][2]
-            low = ohlcv_data[i][3]
-            prev_high = ohlcv_data[i-1][2]
-            prev_low = ohlcv_data[i-1][3]
-            
-            # True Range
-            tr1 = high - low
-            tr2 = abs(high - prev_high)
-            tr3 = abs(low - prev_low)
-            tr = max(tr1, tr2, tr3)
-            true_ranges.append(tr)
-            
-            # Directional Movement
-            up_move = high - prev_high
-            down_move = prev_low - low
-            
-            if up_move > down_move and up_move > 0:
-                plus_dm.append(up_move)
-                minus_dm.append(0)
-            elif down_move > up_move and down_move > 0:
-                plus_dm.append(0)
-                minus_dm.append(down_move)
-            else:
-                plus_dm.append(0)
-                minus_dm.append(0)
-        
-        # Calculate smoothed values
-        adx_values = []
-        for i in range(period, len(true_ranges)):
-            tr_sum = sum(true_ranges[i-period:i])
-            plus_di = (sum(plus_dm[i-period:i]) / tr_sum) * 100
-            minus_di = (sum(minus_dm[i-period:i]) / tr_sum) * 100
-            
-            dx = abs(plus_di - minus_di) / (plus_di + minus_di) * 100 if (plus_di + minus_di) > 0 else 0
-            
-            if i >= period * 2 - 1:
-                # Calculate ADX
-                dx_values = []
-                for j in range(i - period + 1, i + 1):
-                    tr_sum_j = sum(true_ranges[j-period:j])
-                    plus_di_j = (sum(plus_dm[j-period:j]) / tr_sum_j) * 100
-                    minus_di_j = (sum(minus_dm[j-period:j]) / tr_sum_j) * 100
-                    dx_j = abs(plus_di_j - minus_di_j) / (plus_di_j + minus_di_j) * 100 if (plus_di_j + minus_di_j) > 0 else 0
-                    dx_values.append(dx_j)
-                
-                adx = sum(dx_values) / len(dx_values)
-                adx_values.append(adx)
-        
-        return adx_values
+        ohlcv = np.asarray(ohlcv_data, dtype=np.float64)
+        if len(ohlcv) < period + 1:
+            return np.empty(0)
+        
+        high = ohlcv[1:, 2]
+        low = ohlcv[1:, 3]
+        prev_high = ohlcv[:-1, 2]
+        prev_low = ohlcv[:-1, 3]
+        
+        # True Range
+        true_ranges = np.maximum(high - low, np.maximum(np.abs(high - prev_high), np.abs(low - prev_low)))
+        
+        # Directional Movement
+        up_move = high - prev_high
+        down_move = prev_low - low
+        plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+        minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+        
+        # DX over each trailing window ending just before bar i (i >= period)
+        tr_sum = sliding_window_view(true_ranges, period).sum(axis=1)[:-1]
+        plus_sum = sliding_window_view(plus_dm, period).sum(axis=1)[:-1]
+        minus_sum = sliding_window_view(minus_dm, period).sum(axis=1)[:-1]
+        plus_di = np.divide(plus_sum, tr_sum, out=np.zeros_like(tr_sum), where=tr_sum > 0) * 100
+        minus_di = np.divide(minus_sum, tr_sum, out=np.zeros_like(tr_sum), where=tr_sum > 0) * 100
+        di_sum = plus_di + minus_di
+        dx = np.divide(np.abs(plus_di - minus_di), di_sum, out=np.zeros_like(di_sum), where=di_sum > 0) * 100
+        
+        # ADX is the mean DX over the trailing period
+        if len(dx) < period:
+            return np.empty(0)
+        return sliding_window_view(dx, period).mean(axis=1)
 
     def detect_ema_crossover(self, ema_fast: List[float], ema_slow: List[float]) -> Dict[str, Any]:
         """Detect EMA crossover signals"""
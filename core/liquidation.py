@@ -6,9 +6,36 @@ Uses free CCXT order book analysis to detect liquidation clusters and zones
 import ccxt
 import time
 import math
-from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime, timedelta
 
+@dataclass
+class LiquidationClusters:
+    """Cluster price levels and their notional sizes as parallel arrays"""
+    price: np.ndarray
+    size: np.ndarray
+    
+    @classmethod
+    def from_dicts(cls, clusters: List[Dict[str, Any]]) -> 'LiquidationClusters':
+        """Build from a list of {'price': ..., 'size': ...} dicts"""
+        n = len(clusters)
+        return cls(
+            price=np.fromiter((c.get('price', 0) for c in clusters), dtype=np.float64, count=n),
+            size=np.fromiter((c.get('size', 0) for c in clusters), dtype=np.float64, count=n)
+        )
+    
+    @classmethod
+    def coerce(cls, clusters: Union['LiquidationClusters', List[Dict[str, Any]], None]) -> 'LiquidationClusters':
+        """Accept either representation"""
+        if isinstance(clusters, cls):
+            return clusters
+        return cls.from_dicts(clusters or [])
+    
+    def __len__(self) -> int:
+        return len(self.price)
+
 class LiquidationAnalyzer:
     def __init__(self):
         # Initialize CCXT with public access (no auth required)
@@ -30,7 +57,7 @@ class LiquidationAnalyzer:
         """Fetch order book data (public method)"""
         try:
             order_book = self.exchange.fetch_order_book(symbol, limit=limit)
-            return dict(order_book) if order_book is not None else None
+            return order_book if isinstance(order_book, dict) else None
         except Exception as e:
             print(f"Error fetching order book for {symbol}: {e}")
             return None
@@ -0,0 +1,86 @@
+"""
+Market Data Bundle
+Struct-of-arrays container for one symbol's OHLCV and indicator columns
+"""
+
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+OHLCV_COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+INDICATOR_COLUMNS = ('ema_9', 'ema_21', 'ema_20', 'ema_50', 'macd', 'macd_signal', 'rsi', 'vwap', 'atr', 'adx')
+
+@dataclass
+class MarketBundle:
+    symbol: str
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    ema_9: np.ndarray
+    ema_21: np.ndarray
+    ema_20: np.ndarray
+    ema_50: np.ndarray
+    macd: np.ndarray
+    macd_signal: np.ndarray
+    rsi: np.ndarray
+    vwap: np.ndarray
+    atr: np.ndarray
+    adx: np.ndarray
+    _df: Optional[pd.DataFrame] = field(default=None, init=False, repr=False, compare=False)
+    _tail: Optional[SimpleNamespace] = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_arrays(cls, symbol: str, ohlcv: np.ndarray, indicators: Dict[str, np.ndarray]) -> 'MarketBundle':
+        """Bundle an (N, 6) OHLCV array with its indicator columns (missing ones are all-NaN)"""
+        # Columns of a row-major (N, 6) array are strided; one transposed copy makes each contiguous
+        rows = np.ascontiguousarray(np.asarray(ohlcv, dtype=np.float64).T)
+        columns = dict(zip(OHLCV_COLUMNS, rows))
+        for name in INDICATOR_COLUMNS:
+            values = indicators.get(name)
+            columns[name] = (np.full(len(rows[0]), np.nan) if values is None
+                             else np.ascontiguousarray(values, dtype=np.float64))
+        return cls(symbol=symbol, **columns)
+
+    @classmethod
+    def empty_bundle(cls, symbol: str) -> 'MarketBundle':
+        """Bundle with no bars"""
+        return cls.from_arrays(symbol, np.empty((0, len(OHLCV_COLUMNS))), {})
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def __getitem__(self, column: str):
+        """Column access by name, so DataFrame-style data['close'] lookups keep working"""
+        return getattr(self, column)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.close) == 0
+
+    def tail_stats(self) -> SimpleNamespace:
+        """Last-bar reads shared by the strategies: avg_volume (previous 9 bars), current_volume, atr"""
+        if self._tail is None:
+            # NumPy scalars, so a zero average volume still divides to inf rather than raising
+            n = len(self.close)
+            zero = np.float64(0.0)
+            self._tail = SimpleNamespace(
+                avg_volume=self.volume[-10:-1].mean() if n >= 10 else zero,
+                current_volume=self.volume[-1] if n > 0 else zero,
+                atr=self.atr[-1] if n > 0 else zero
+            )
+        return self._tail
+    
+    def to_df(self) -> pd.DataFrame:
+        """DataFrame view for legacy callers, built once on first use"""
+        if self._df is None:
+            df = pd.DataFrame({name: getattr(self, name) for name in OHLCV_COLUMNS})
+            df['symbol'] = self.symbol
+            for name in INDICATOR_COLUMNS:
+                df[name] = getattr(self, name)
+            self._df = df
+        return self._df
@@ -3,12 +3,48 @@ Signal Notifier Module
 Formats and sends signals to Telegram channels
 """
 
+import logging
+import queue
+import threading
+import time
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 class SignalNotifier:
-    def __init__(self):
-        pass
+    def __init__(self, min_send_interval: float = 1.0):
+        # Outgoing signals are queued and sent by a worker, at most one per interval
+        self.min_send_interval = min_send_interval
+        self._send_queue = queue.Queue()
+        self._sender_thread = None
+        self._sender_lock = threading.Lock()
+        self._last_sent_ts = 0.0
+    
+    def send_throttled(self, signal_data: Dict[str, Any]):
+        """Queue a signal for sending without blocking the caller"""
+        with self._sender_lock:
+            if self._sender_thread is None or not self._sender_thread.is_alive():
+                self._sender_thread = threading.Thread(target=self._sender_loop, name="notifier-sender", daemon=True)
+                self._sender_thread.start()
+        self._send_queue.put(signal_data)
+    
+    def _sender_loop(self):
+        """Send queued signals, spacing them by min_send_interval"""
+        while True:
+            signal_data = self._send_queue.get()
+            try:
+                wait = self._last_sent_ts + self.min_send_interval - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                
+                # No Telegram client here; the bot delivers signals through its own sender
+                logger.debug("Would send signal: %s", signal_data)
+                self._last_sent_ts = time.monotonic()
+            except Exception as e:
+                logger.error("Error sending signal: %s", e)
+            finally:
+                self._send_queue.task_done()
     
     def format_signal_message(self, signal_data: Dict[str, Any], signal_id: Optional[str] = None) -> str:
         """Format professional signal message for main channel with advanced features"""
@@ -0,0 +1,31 @@
+"""
+Rate Limiter Module
+Token bucket for pacing outgoing API calls from an asyncio event loop
+"""
+
+import asyncio
+import time
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: int):
+        # Refills `rate` tokens per second up to `capacity`; starts full so short bursts go out at once
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        """Add the tokens accrued since the last update"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        # Callers share one event loop, so check-and-take cannot interleave
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
@@ -54,10 +54,10 @@ class RiskManager:
                 tp3 = entry_price - tp3_distance
             
             return {
-                'stop_loss': round(stop_loss, 6),
-                'tp1': round(tp1, 6),
-                'tp2': round(tp2, 6),
-                'tp3': round(tp3, 6),
+                'stop_loss': stop_loss,
+                'tp1': tp1,
+                'tp2': tp2,
+                'tp3': tp3,
                 'atr_distance': base_atr
             }
         except Exception as e:
@@ -93,10 +93,10 @@ class RiskManager:
             leverage = min(self.max_leverage, self.account_balance / (adjusted_position_size * entry_price * 0.1))
             
             return {
-                'position_size': round(adjusted_position_size, 6),
-                'risk_amount': round(risk_amount, 2),
-                'leverage': round(leverage, 2),
-                'position_value': round(position_value, 2)
+                'position_size': adjusted_position_size,
+                'risk_amount': risk_amount,
+                'leverage': leverage,
+                'position_value': position_value
             }
         except Exception as e:
             print(f"Error calculating position size: {e}")
@@ -188,7 +188,7 @@ class RiskManager:
                     else:  # SHORT
                         pnl_percent = ((entry_price - current_price) / entry_price) * 100
                     
-                    trade['unrealized_pnl'] = round(pnl_percent, 2)
+                    trade['unrealized_pnl'] = pnl_percent
                     
                     # Check for TP/SL hits
                     if hit_type:
@@ -307,8 +307,8 @@ class RiskManager:
             
             risk_status = {
                 'within_limits': True,
-                'exposure_ratio': round(exposure_ratio, 3),
-                'portfolio_beta': round(portfolio_beta, 3),
+                'exposure_ratio': exposure_ratio,
+                'portfolio_beta': portfolio_beta,
                 'high_correlation_pairs': high_correlation_pairs,
                 'warnings': []
             }
@@ -345,6 +345,9 @@ class RiskManager:
             ])
             
             risk_status = self.check_portfolio_risk_limits()
+            if 'exposure_ratio' in risk_status:
+                risk_status['exposure_ratio'] = round(risk_status['exposure_ratio'], 3)
+                risk_status['portfolio_beta'] = round(risk_status['portfolio_beta'], 3)
             
             return {
                 'active_trades': active_trades,
@@ -358,4 +361,18 @@ class RiskManager:
             }
         except Exception as e:
             print(f"Error getting portfolio summary: {e}")
-            return {} 
\ No newline at end of file
+            return {}
+    
+    def _serialize_trade(self, trade: Dict[str, Any]) -> Dict[str, Any]:
+        """Round trade values for display (internal state keeps full precision)"""
+        serialized = dict(trade)
+        for key in ('entry_price', 'stop_loss', 'tp1', 'tp2', 'tp3', 'position_size', 'current_price'):
+            if isinstance(serialized.get(key), float):
+                serialized[key] = round(serialized[key], 6)
+        if isinstance(serialized.get('unrealized_pnl'), float):
+            serialized['unrealized_pnl'] = round(serialized['unrealized_pnl'], 2)
+        return serialized
+    
+    def get_active_trades(self) -> Dict[str, Dict[str, Any]]:
+        """Get active trades rounded for API output"""
+        return {trade_id: self._serialize_trade(trade) for trade_id, trade in self.active_trades.items()}
@@ -3,11 +3,122 @@ Market Scanner Module
 Scans Binance futures markets using free CCXT public methods
 """
 
+import asyncio
+import logging
+import aiohttp
 import ccxt
+import ccxt.async_support as ccxt_async
+import ccxt.pro as ccxt_pro
+import threading
 import time
 import math
-from typing import List, Dict, Any, Optional
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Callable
+from dataclasses import dataclass
 from datetime import datetime
+from .jit import njit
+from ._ranking import normalize_metrics, combined_scores, top_order, summary_averages
+
+logger = logging.getLogger(__name__)
+
+@njit(cache=True, nogil=True)
+def _atr_and_score(ohlcv: np.ndarray) -> Tuple[float, float]:
+    """ATR and RSI/MACD/VWAP confluence score (0-100) in one pass over an (N, 6) OHLCV array"""
+    n = ohlcv.shape[0]
+    
+    tr_sum = 0.0
+    tr_count = 0
+    avg_gain = 0.0
+    avg_loss = 0.0
+    sum12 = 0.0
+    sum26 = 0.0
+    pv_sum = 0.0
+    vol_sum = 0.0
+    
+    for i in range(n):
+        close = ohlcv[i, 4]
+        volume = ohlcv[i, 5]
+        
+        # VWAP and MACD proxy sums
+        pv_sum += close * volume
+        vol_sum += volume
+        if i >= n - 12:
+            sum12 += close
+        if i >= n - 26:
+            sum26 += close
+        
+        # True range and RSI changes over the last 14 bars
+        if i >= 1 and i >= n - 14:
+            high = ohlcv[i, 2]
+            low = ohlcv[i, 3]
+            prev_close = ohlcv[i - 1, 4]
+            tr_sum += max(high - low, abs(high - prev_close), abs(low - prev_close))
+            tr_count += 1
+            
+            change = close - prev_close
+            if change > 0:
+                avg_gain += change
+            else:
+                avg_loss -= change
+    
+    atr = tr_sum / tr_count if n >= 14 and tr_count > 0 else 0.0
+    
+    if n < 26 or vol_sum == 0:
+        return atr, 0.0
+    
+    avg_gain /= 14
+    avg_loss /= 14
+    if avg_loss == 0:
+        rsi = 100.0
+    else:
+        rs = avg_gain / avg_loss
+        rsi = 100 - (100 / (1 + rs))
+    
+    macd = sum12 / 12 - sum26 / 26
+    vwap = pv_sum / vol_sum
+    current_price = ohlcv[n - 1, 4]
+    vwap_slope = (current_price - vwap) / vwap * 100
+    
+    # Calculate technical score (0-100)
+    rsi_score = 50 - abs(rsi - 50)  # Higher score when RSI is neutral
+    macd_score = 50 + (macd / current_price * 1000)  # Higher score for positive MACD
+    vwap_score = 50 + vwap_slope  # Higher score for positive VWAP slope
+    
+    technical_score = (rsi_score + macd_score + vwap_score) / 3
+    return atr, max(0.0, min(100.0, technical_score))
+
+# Warm the JIT so the first scan doesn't pay the compile cost
+_atr_and_score(np.column_stack((np.zeros(30), np.ones(30), np.full(30, 2.0), np.ones(30),
+                                np.linspace(1.0, 2.0, 30), np.ones(30))))
+
+@dataclass
+class MarketMetrics:
+    symbols: List[str]
+    values: np.ndarray  # (N, 3): atr, technical_score, liquidation_density
+    
+    @classmethod
+    def from_markets(cls, markets: List[Dict[str, Any]]) -> 'MarketMetrics':
+        """Stack scanned market metrics into a single (N, 3) array"""
+        symbols = [market['symbol'] for market in markets]
+        values = np.array(
+            [[m['atr'], m['technical_score'], m['liquidation_density']] for m in markets],
+            dtype=np.float64
+        ).reshape(len(markets), 3)
+        return cls(symbols, values)
+    
+    @property
+    def atr(self) -> np.ndarray:
+        return self.values[:, 0]
+    
+    @property
+    def technical_score(self) -> np.ndarray:
+        return self.values[:, 1]
+    
+    @property
+    def liquidation_density(self) -> np.ndarray:
+        return self.values[:, 2]
 
 class MarketScanner:
     def __init__(self):
@@ -24,225 +135,459 @@ class MarketScanner:
         self.max_spread = 0.01            # 1% for testing (was 0.1%)
         
         # Cache for market data
-        self.market_cache = {}
+        self.market_cache = {}  # (symbol, timeframe, limit) -> OHLCV array for the current minute
+        self._ohlcv_cache_bucket = 0
         self.cache_expiry = 60  # 60 seconds
+        self._pairs_cache = None
+        self._pairs_cache_ts = 0.0
+        
+        # Maximum number of symbols fetched concurrently during a scan
+        self.max_concurrent_requests = 20
+        
+        # Worker threads for per-symbol metrics; the numba kernel releases the GIL
+        self._compute_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 4,
+                                                thread_name_prefix="scan-metrics")
+        
+        # Long-lived event loop so the async client and its connection pool survive between scans
+        self._loop = None
+        self._loop_lock = threading.Lock()
+        self._async_exchange = None
+        self._async_markets_ts = None
+        self.rate_limit_ms = 50  # Binance futures request budget per CCXT throttle tick
+        
+        # Live tickers pushed over the websocket stream
+        self._live_tickers = {}
+        self._live_tickers_ts = 0.0
+        self._live_tickers_lock = threading.Lock()
+        self._ticker_future = None
+        self._ticker_listeners = []
+        self.ticker_stale_after = 30  # seconds without an update before falling back to REST
+        
+        # Wilder-smoothed RSI/ATR state per symbol, advanced only by newly closed bars
+        self._ta_state = {}
+        self._ta_state_lock = threading.Lock()
+        self.ta_period = 14
+        
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the scanner's background event loop, starting it on first use"""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="scanner-loop", daemon=True).start()
+            return self._loop
+    
+    def _get_async_exchange(self):
+        """Return the shared async CCXT client backed by a keep-alive connection pool"""
+        if self._async_exchange is None:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=60)
+            )
+            self._async_exchange = ccxt_async.binance({
+                'options': {'defaultType': 'future'},
+                'enableRateLimit': True,
+                'rateLimit': self.rate_limit_ms,
+                'session': session
+            })
+        
+        # Share the markets loaded by the sync client whenever they are refreshed
+        if self.exchange.markets and self._async_markets_ts != self._pairs_cache_ts:
+            self._async_exchange.set_markets(self.exchange.markets, self.exchange.currencies)
+            self._async_markets_ts = self._pairs_cache_ts
+        return self._async_exchange
+    
+    async def _close_async(self):
+        """Close the async client and its HTTP session"""
+        if self._async_exchange is not None:
+            session = self._async_exchange.session
+            await self._async_exchange.close()
+            if session is not None:
+                await session.close()
+            self._async_exchange = None
+    
+    def close(self):
+        """Stop the ticker stream, close network clients, the metrics pool and the background loop"""
+        # The pool exists whether or not an async scan ever started the loop
+        self._compute_pool.shutdown(wait=False)
+        if self._loop is None:
+            return
+        if self._ticker_future is not None:
+            self._ticker_future.cancel()
+        asyncio.run_coroutine_threadsafe(self._close_async(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+    
+    def add_ticker_listener(self, callback: Callable[[Dict[str, Dict[str, Any]]], None]):
+        """Call `callback(tickers)` on the scanner loop with every ticker batch the stream delivers"""
+        self._ticker_listeners.append(callback)
+    
+    def start_ticker_stream(self):
+        """Start the background websocket ticker stream (idempotent)"""
+        if self._ticker_future is not None and not self._ticker_future.done():
+            return
+        self._ticker_future = asyncio.run_coroutine_threadsafe(self._ticker_pump(), self._get_loop())
+    
+    async def _ticker_pump(self):
+        """Keep _live_tickers updated from the Binance futures ticker stream"""
+        exchange = ccxt_pro.binance({
+            'options': {'defaultType': 'future'},
+            'enableRateLimit': True
+        })
+        retry_delay = 1
+        try:
+            while True:
+                try:
+                    tickers = await exchange.watch_tickers()
+                    with self._live_tickers_lock:
+                        self._live_tickers.update(tickers)
+                        self._live_tickers_ts = time.monotonic()
+                    for callback in self._ticker_listeners:
+                        try:
+                            callback(tickers)
+                        except Exception as e:
+                            logger.error("Error in ticker listener: %s", e)
+                    retry_delay = 1
+                except Exception as e:
+                    logger.error("Error in ticker stream: %s", e)
+                    await asyncio.sleep(retry_delay)
+                    retry_delay = min(retry_delay * 2, 60)
+        finally:
+            await exchange.close()
+    
+    def get_live_tickers(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot of streamed tickers, empty if the stream is down or stale"""
+        with self._live_tickers_lock:
+            if not self._live_tickers or time.monotonic() - self._live_tickers_ts > self.ticker_stale_after:
+                return {}
+            return dict(self._live_tickers)
         
     def fetch_all_futures_pairs(self) -> List[str]:
         """Fetch all available futures pairs from Binance (public method)"""
+        if self._pairs_cache is not None and time.monotonic() - self._pairs_cache_ts < self.cache_expiry:
+            return self._pairs_cache
+        
         try:
             # Load markets (public method, no auth required)
-            markets = self.exchange.load_markets()
+            markets = self.exchange.load_markets(reload=self._pairs_cache is not None)
             futures_pairs = []
             
             for symbol, market in markets.items():
                 if market['type'] == 'future' and market['active']:
                     futures_pairs.append(symbol)
             
-            print(f"Found {len(futures_pairs)} futures pairs")
+            self._pairs_cache = futures_pairs
+            self._pairs_cache_ts = time.monotonic()
+            
+            logger.info("Found %d futures pairs", len(futures_pairs))
             return futures_pairs
         except Exception as e:
-            print(f"Error fetching futures pairs: {e}")
+            logger.error("Error fetching futures pairs: %s", e)
             return []
     
-    def fetch_ticker_data(self, symbol: str) -> Optional[Dict[str, Any]]:
-        """Fetch ticker data for a symbol (public method)"""
+    async def fetch_all_tickers(self, exchange) -> Dict[str, Dict[str, Any]]:
+        """Fetch tickers for every futures symbol in a single call (public method)"""
         try:
-            ticker = self.exchange.fetch_ticker(symbol)
-            return dict(ticker) if ticker is not None else None
+            tickers = await exchange.fetch_tickers()
+            return tickers or {}
         except Exception as e:
-            print(f"Error fetching ticker for {symbol}: {e}")
-            return None
+            logger.error("Error fetching tickers: %s", e)
+            return {}
 
-    def fetch_funding_rate(self, symbol: str) -> Optional[float]:
-        """Fetch funding rate for a symbol (public method)"""
+    async def fetch_all_funding_rates(self, exchange) -> Dict[str, float]:
+        """Fetch funding rates for every futures symbol in a single call (public method)"""
         try:
-            funding_info = self.exchange.fetch_funding_rate(symbol)
-            return funding_info.get('fundingRate', 0)
+            funding_info = await exchange.fetch_funding_rates()
+            return {
+                symbol: info.get('fundingRate', 0)
+                for symbol, info in (funding_info or {}).items()
+            }
         except Exception as e:
-            print(f"Error fetching funding rate for {symbol}: {e}")
-            return None
+            logger.error("Error fetching funding rates: %s", e)
+            return {}
 
-    def fetch_order_book(self, symbol: str) -> Optional[Dict[str, Any]]:
+    async def fetch_order_book(self, exchange, symbol: str) -> Optional[Dict[str, Any]]:
         """Fetch order book to calculate spread (public method)"""
         try:
-            order_book = self.exchange.fetch_order_book(symbol, limit=20)
-            # Ensure order_book is a dictionary before accessing
-            if isinstance(order_book, dict) and order_book.get('asks') and order_book.get('bids'):
-                # Safely access order book data
-                asks = order_book.get('asks', [])
-                bids = order_book.get('bids', [])
-                
-                if asks and bids:
-                    best_ask = asks[0][0] if isinstance(asks[0], (list, tuple)) and len(asks[0]) > 0 else 0
-                    best_bid = bids[0][0] if isinstance(bids[0], (list, tuple)) and len(bids[0]) > 0 else 0
-                    
-                    # Ensure we have numeric values before calculation
-                    if isinstance(best_ask, (int, float)) and isinstance(best_bid, (int, float)) and best_bid != 0:
-                        spread = (best_ask - best_bid) / best_bid
-                    else:
-                        spread = 0
-                else:
-                    spread = 0
-            else:
-                spread = 0
+            order_book = await exchange.fetch_order_book(symbol, limit=20)
+            bids = order_book.get('bids') if isinstance(order_book, dict) else None
+            asks = order_book.get('asks') if isinstance(order_book, dict) else None
+            
+            # Parse the top of book once; spread and density both read these buffers
+            bids_arr = np.asarray([level[:2] for level in bids[:20]], dtype=np.float64) if bids else np.empty((0, 2))
+            asks_arr = np.asarray([level[:2] for level in asks[:20]], dtype=np.float64) if asks else np.empty((0, 2))
+            
+            best_ask = asks_arr[0, 0] if len(asks_arr) else 0
+            best_bid = bids_arr[0, 0] if len(bids_arr) else 0
+            spread = (best_ask - best_bid) / best_bid if best_ask and best_bid else 0
+            
             return {
                 'spread': spread, 
                 'best_ask': best_ask, 
                 'best_bid': best_bid,
-                'order_book': order_book
+                'order_book': order_book,
+                'bids_arr': bids_arr,
+                'asks_arr': asks_arr
             }
         except Exception as e:
-            print(f"Error fetching order book for {symbol}: {e}")
+            logger.error("Error fetching order book for %s: %s", symbol, e)
             return None
 
-    def fetch_ohlcv_data(self, symbol: str, timeframe: str = '1h', limit: int = 100) -> Optional[List]:
-        """Fetch OHLCV data for volatility calculation (public method)"""
+    async def fetch_ohlcv_data(self, exchange, symbol: str, timeframe: str = '1h', limit: int = 100) -> Optional[np.ndarray]:
+        """Fetch OHLCV data as an (N, 6) float64 array for volatility calculation (public method)"""
+        bucket = int(time.time() // 60)
+        if bucket != self._ohlcv_cache_bucket:
+            # Candles memoized in an earlier minute are stale
+            self.market_cache.clear()
+            self._ohlcv_cache_bucket = bucket
+        
+        cache_key = (symbol, timeframe, limit)
+        if cache_key in self.market_cache:
+            return self.market_cache[cache_key]
+        
         try:
-            ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
-            return ohlcv
+            ohlcv = await exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+            if not ohlcv:
+                return None
+            ohlcv_arr = np.asarray(ohlcv, dtype=np.float64)
+            self.market_cache[cache_key] = ohlcv_arr
+            
+            return ohlcv_arr
         except Exception as e:
-            print(f"Error fetching OHLCV for {symbol}: {e}")
+            logger.error("Error fetching OHLCV for %s: %s", symbol, e)
             return None
 
-    def calculate_atr(self, ohlcv_data: List) -> float:
+    def calculate_atr(self, ohlcv_data: np.ndarray) -> float:
         """Calculate Average True Range for volatility"""
         if len(ohlcv_data) < 14:
             return 0
         
         try:
-            true_ranges = []
-            for i in range(1, len(ohlcv_data)):
-                high = ohlcv_data[i][2]
-                low = ohlcv_data[i][3]
-                prev_close = ohlcv_data[i-1][4]
-                
-                tr1 = high - low
-                tr2 = abs(high - prev_close)
-                tr3 = abs(low - prev_close)
-                true_range = max(tr1, tr2, tr3)
-                true_ranges.append(true_range)
+            high = ohlcv_data[1:, 2]
+            low = ohlcv_data[1:, 3]
+            prev_close = ohlcv_data[:-1, 4]
+            
+            true_range = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
             
             # Calculate 14-period ATR
-            atr = sum(true_ranges[-14:]) / 14
-            return atr
+            return float(true_range[-14:].mean())
         except Exception as e:
-            print(f"Error calculating ATR: {e}")
+            logger.error("Error calculating ATR: %s", e)
             return 0
     
-    def calculate_technical_score(self, ohlcv_data: List) -> float:
+    def calculate_technical_score(self, ohlcv_data: np.ndarray) -> float:
         """Calculate technical score based on RSI, MACD, VWAP confluence"""
         if len(ohlcv_data) < 26:
             return 0
         
         try:
-            closes = [candle[4] for candle in ohlcv_data]
-            
-            # Simple RSI calculation
-            gains = []
-            losses = []
-            for i in range(1, len(closes)):
-                change = closes[i] - closes[i-1]
-                if change > 0:
-                    gains.append(change)
-                    losses.append(0)
-                else:
-                    gains.append(0)
-                    losses.append(abs(change))
-            
-            avg_gain = sum(gains[-14:]) / 14 if gains else 0
-            avg_loss = sum(losses[-14:]) / 14 if losses else 0
-            
-            if avg_loss == 0:
-                rsi = 100
-            else:
-                rs = avg_gain / avg_loss
-                rsi = 100 - (100 / (1 + rs))
-            
-            # Simple MACD
-            ema12 = sum(closes[-12:]) / 12
-            ema26 = sum(closes[-26:]) / 26
-            macd = ema12 - ema26
-            
-            # Simple VWAP
-            volumes = [candle[5] for candle in ohlcv_data]
-            vwap = sum(closes[i] * volumes[i] for i in range(len(closes))) / sum(volumes)
-            current_price = closes[-1]
-            vwap_slope = (current_price - vwap) / vwap * 100
-            
-            # Calculate technical score (0-100)
-            rsi_score = 50 - abs(rsi - 50)  # Higher score when RSI is neutral
-            macd_score = 50 + (macd / current_price * 1000)  # Higher score for positive MACD
-            vwap_score = 50 + vwap_slope  # Higher score for positive VWAP slope
-            
-            technical_score = (rsi_score + macd_score + vwap_score) / 3
-            return max(0, min(100, technical_score))
+            return float(_atr_and_score(ohlcv_data)[1])
             
         except Exception as e:
-            print(f"Error calculating technical score: {e}")
+            logger.error("Error calculating technical score: %s", e)
             return 0
     
-    def get_liquidation_density(self, symbol: str, order_book: Optional[Dict[str, Any]] = None) -> float:
+    def calculate_metrics(self, ohlcv_data: np.ndarray) -> Tuple[float, float]:
+        """Calculate ATR and technical score in a single pass over the OHLCV array"""
+        try:
+            atr, technical_score = _atr_and_score(ohlcv_data)
+            return float(atr), float(technical_score)
+        except Exception as e:
+            logger.error("Error calculating market metrics: %s", e)
+            return 0, 0
+    
+    def get_liquidation_density(self, symbol: str, bids_arr: Optional[np.ndarray] = None,
+                                asks_arr: Optional[np.ndarray] = None) -> float:
         """Calculate liquidation density using order book analysis (free method)"""
         try:
-            if not order_book:
+            if bids_arr is None or asks_arr is None:
                 return 0.0  # Default value for deployment version
             
-            # Analyze order book for liquidation clusters
-            bids = order_book.get('bids', [])
-            asks = order_book.get('asks', [])
-            
-            if not bids or not asks:
+            if not len(bids_arr) or not len(asks_arr):
                 return 50.0
             
-            # Calculate bid/ask imbalance
-            total_bid_volume = sum(bid[1] for bid in bids[:10])  # Top 10 bids
-            total_ask_volume = sum(ask[1] for ask in asks[:10])  # Top 10 asks
+            # Calculate bid/ask imbalance over the top 10 levels
+            total_bid_volume = bids_arr[:10, 1].sum()
+            total_ask_volume = asks_arr[:10, 1].sum()
+            if max(total_bid_volume, total_ask_volume) <= 0:
+                return 50.0
             
             # Calculate imbalance ratio
             imbalance_ratio = abs(total_bid_volume - total_ask_volume) / max(total_bid_volume, total_ask_volume)
             
             # Convert to liquidation density score (0-100)
-            liquidation_density = min(100, imbalance_ratio * 100)
-            
-            return liquidation_density
+            return float(min(100.0, imbalance_ratio * 100))
             
         except Exception as e:
-            print(f"Error calculating liquidation density for {symbol}: {e}")
+            logger.error("Error calculating liquidation density for %s: %s", symbol, e)
             return 50.0  # Default value
     
-    def scan_and_filter_markets(self) -> List[Dict[str, Any]]:
-        """Scan all markets and apply filters using free CCXT methods"""
-        print("Starting market scan...")
+    def get_full_book(self, symbol: str, limit: int = 20) -> Optional[Dict[str, Any]]:
+        """Fetch the full order book for a symbol on demand (public method)"""
+        try:
+            order_book = self.exchange.fetch_order_book(symbol, limit=limit)
+            return order_book if isinstance(order_book, dict) else None
+        except Exception as e:
+            logger.error("Error fetching order book for %s: %s", symbol, e)
+            return None
+    
+    def _seed_ta_state(self, closed: np.ndarray) -> Optional[Dict[str, float]]:
+        """Seed Wilder RSI/ATR state from a window of closed bars"""
+        period = self.ta_period
+        if len(closed) < period + 1:
+            return None
+        
+        state = {
+            'ts': closed[period, 0],
+            'last_close': closed[period, 4],
+            'avg_gain': 0.0,
+            'avg_loss': 0.0,
+            'atr': 0.0
+        }
+        
+        # First averages are simple means over the first `period` bars
+        prev_close = closed[:period, 4]
+        high, low, close = closed[1:period + 1, 2], closed[1:period + 1, 3], closed[1:period + 1, 4]
+        change = close - prev_close
+        state['avg_gain'] = float(np.maximum(change, 0.0).mean())
+        state['avg_loss'] = float(np.maximum(-change, 0.0).mean())
+        state['atr'] = float(np.maximum(high - low, np.maximum(np.abs(high - prev_close),
+                                                               np.abs(low - prev_close))).mean())
+        
+        self._fold_bars(state, closed[period + 1:])
+        return state
+    
+    def _fold_bars(self, state: Dict[str, float], bars: np.ndarray):
+        """Advance Wilder RSI/ATR state by a run of new closed bars"""
+        m = len(bars)
+        if not m:
+            return
+        period = self.ta_period
+        high, low, close = bars[:, 2], bars[:, 3], bars[:, 4]
+        prev_close = np.concatenate(([state['last_close']], close[:-1]))
+        change = close - prev_close
+        true_range = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+        
+        # Wilder's x = (x*(p-1) + v)/p unrolled over the run: a bar k steps old is weighted decay**k / p
+        decay = (period - 1) / period
+        weights = decay ** np.arange(m - 1, -1, -1) / period
+        carry = decay ** m
+        state['atr'] = float(state['atr'] * carry + weights @ true_range)
+        state['avg_gain'] = float(state['avg_gain'] * carry + weights @ np.maximum(change, 0.0))
+        state['avg_loss'] = float(state['avg_loss'] * carry + weights @ np.maximum(-change, 0.0))
+        state['last_close'] = close[-1]
+        state['ts'] = bars[-1, 0]
+    
+    def update_ta_state(self, symbol: str, ohlcv: np.ndarray) -> Optional[Tuple[float, float]]:
+        """Fold newly closed bars into the symbol's running state; returns (atr, rsi)"""
+        try:
+            # The last candle is still forming; only closed bars update the state
+            closed = ohlcv[:-1]
+            if not len(closed):
+                return None
+            
+            with self._ta_state_lock:
+                state = self._ta_state.get(symbol)
+                if state is not None:
+                    new_start = int(np.searchsorted(closed[:, 0], state['ts'], side='right'))
+                    # Reseed if the candles no longer connect to the stored state
+                    if new_start == 0 or closed[new_start - 1, 0] != state['ts']:
+                        state = None
+                    else:
+                        self._fold_bars(state, closed[new_start:])
+                if state is None:
+                    state = self._seed_ta_state(closed)
+                    if state is None:
+                        return None
+                    self._ta_state[symbol] = state
+                
+                if state['avg_loss'] == 0:
+                    rsi = 100.0
+                else:
+                    rsi = 100 - (100 / (1 + state['avg_gain'] / state['avg_loss']))
+                return float(state['atr']), float(rsi)
+        except Exception as e:
+            logger.error("Error updating TA state for %s: %s", symbol, e)
+            return None
+    
+    def _compute_market_metrics(self, symbol: str, ohlcv: np.ndarray,
+                                order_book_data: Dict[str, Any]) -> Tuple[float, float, float, Optional[float], Optional[float]]:
+        """Compute ATR, technical score, liquidation density and the Wilder ATR/RSI for one symbol
+
+        `atr` stays the 14-bar mean that rank_markets scores on; the Wilder values are reported alongside.
+        """
+        atr, technical_score = self.calculate_metrics(ohlcv)
+        wilder_atr = wilder_rsi = None
+        streamed = self.update_ta_state(symbol, ohlcv)
+        if streamed is not None:
+            wilder_atr, wilder_rsi = streamed
+        liquidation_density = self.get_liquidation_density(
+            symbol, order_book_data['bids_arr'], order_book_data['asks_arr'])
+        return atr, technical_score, liquidation_density, wilder_atr, wilder_rsi
+    
+    async def _fetch_symbol_data(self, exchange, semaphore: asyncio.Semaphore,
+                                 symbol: str) -> Tuple[str, List[Any]]:
+        """Fetch order book and OHLCV for a symbol concurrently"""
+        async with semaphore:
+            results = await asyncio.gather(
+                self.fetch_order_book(exchange, symbol),
+                self.fetch_ohlcv_data(exchange, symbol),
+                return_exceptions=True
+            )
+        return symbol, [None if isinstance(r, Exception) else r for r in results]
+    
+    async def scan_and_filter_markets_async(self) -> List[Dict[str, Any]]:
+        """Scan all markets concurrently and apply filters using free CCXT methods"""
+        logger.info("Starting market scan...")
+        self.start_ticker_stream()
         
         # Fetch all futures pairs
-        all_pairs = self.fetch_all_futures_pairs()
+        all_pairs = await asyncio.to_thread(self.fetch_all_futures_pairs)
         if not all_pairs:
             return []
         
         filtered_markets = []
+        exchange = self._get_async_exchange()
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
         
+        # Tickers come from the websocket stream; REST is the fallback while it warms up
+        all_tickers = self.get_live_tickers()
+        if all_tickers:
+            funding_rates = await self.fetch_all_funding_rates(exchange)
+        else:
+            all_tickers, funding_rates = await asyncio.gather(
+                self.fetch_all_tickers(exchange),
+                self.fetch_all_funding_rates(exchange)
+            )
+        
+        candidates = []
         for symbol in all_pairs:
-            try:
-                print(f"Scanning {symbol}...")
-                
-                # Fetch market data (public methods)
-                ticker = self.fetch_ticker_data(symbol)
-                if not ticker:
-                    continue
-                
-                # Volume filter
-                volume_usd = ticker.get('quoteVolume', 0)
-                if volume_usd < self.min_volume_usd:
+            ticker = all_tickers.get(symbol)
+            if not ticker:
+                continue
+            
+            # Volume filter
+            volume_usd = ticker.get('quoteVolume') or 0
+            if volume_usd < self.min_volume_usd:
+                continue
+            
+            # Funding rate filter
+            funding_rate = funding_rates.get(symbol)
+            if funding_rate is not None:
+                if funding_rate > self.max_funding_rate or funding_rate < self.min_funding_rate:
                     continue
-                
-                # Funding rate filter
-                funding_rate = self.fetch_funding_rate(symbol)
-                if funding_rate is not None:
-                    if funding_rate > self.max_funding_rate or funding_rate < self.min_funding_rate:
-                        continue
+            
+            candidates.append(symbol)
+        
+        tasks = [self._fetch_symbol_data(exchange, semaphore, symbol) for symbol in candidates]
+        loop = asyncio.get_running_loop()
+        pending = []
+        
+        for coro in asyncio.as_completed(tasks):
+            symbol, (order_book_data, ohlcv) = await coro
+            try:
+                ticker = all_tickers[symbol]
+                volume_usd = ticker.get('quoteVolume') or 0
+                funding_rate = funding_rates.get(symbol)
                 
                 # Spread filter
-                order_book_data = self.fetch_order_book(symbol)
                 if order_book_data:
                     spread = order_book_data['spread']
                     if spread > self.max_spread:
@@ -251,16 +596,10 @@ class MarketScanner:
                     # If we can't get spread, skip this symbol
                     continue
                 
-                # Fetch OHLCV for technical analysis
-                ohlcv = self.fetch_ohlcv_data(symbol)
-                if not ohlcv:
+                # OHLCV for technical analysis
+                if ohlcv is None:
                     continue
                 
-                # Calculate metrics
-                atr = self.calculate_atr(ohlcv)
-                technical_score = self.calculate_technical_score(ohlcv)
-                liquidation_density = self.get_liquidation_density(symbol, order_book_data.get('order_book') or {})
-                
                 # Create market data
                 market_data = {
                     'symbol': symbol,
@@ -268,61 +607,73 @@ class MarketScanner:
                     'volume_24h': volume_usd,
                     'funding_rate': funding_rate or 0,
                     'spread': order_book_data['spread'],
-                    'atr': atr,
-                    'technical_score': technical_score,
-                    'liquidation_density': liquidation_density,
                     'ticker': ticker,
-                    'order_book': order_book_data,
-                    'ohlcv': ohlcv
+                    # Only top-of-book scalars travel with the market; see get_full_book
+                    'order_book': {
+                        'best_bid': order_book_data['best_bid'],
+                        'best_ask': order_book_data['best_ask'],
+                        'spread': order_book_data['spread']
+                    }
                 }
                 
-                filtered_markets.append(market_data)
-                
-                # Rate limiting
-                time.sleep(0.1)
+                # Calculate metrics on the worker pool while the remaining fetches complete
+                metrics = loop.run_in_executor(
+                    self._compute_pool, self._compute_market_metrics, symbol, ohlcv, order_book_data)
+                pending.append((market_data, metrics))
                 
             except Exception as e:
-                print(f"Error processing {symbol}: {e}")
+                logger.debug("Error processing %s: %s", symbol, e)
                 continue
         
-        print(f"Filtered {len(filtered_markets)} markets from {len(all_pairs)} total")
+        results = await asyncio.gather(*(metrics for _, metrics in pending), return_exceptions=True)
+        for (market_data, _), result in zip(pending, results):
+            if isinstance(result, Exception):
+                logger.error("Error processing %s: %s", market_data['symbol'], result)
+                continue
+            (market_data['atr'], market_data['technical_score'],
+             market_data['liquidation_density'], market_data['wilder_atr'], market_data['wilder_rsi']) = result
+            filtered_markets.append(market_data)
+        
+        logger.info("Filtered %d markets from %d total", len(filtered_markets), len(all_pairs))
         return filtered_markets
     
-    def rank_markets(self, markets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Rank markets by volatility, liquidation density, and technical score"""
+    def scan_and_filter_markets(self) -> List[Dict[str, Any]]:
+        """Scan all markets and apply filters (blocking wrapper for sync callers)"""
+        future = asyncio.run_coroutine_threadsafe(self.scan_and_filter_markets_async(), self._get_loop())
+        return future.result()
+    
+    def rank_markets(self, markets: List[Dict[str, Any]], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Rank markets by volatility, liquidation density, and technical score (top `limit` if given)"""
         if not markets:
             return []
         
         try:
-            # Normalize scores (0-100)
-            max_atr = max(m['atr'] for m in markets) if markets else 1
-            max_technical = max(m['technical_score'] for m in markets) if markets else 1
-            max_liquidation = max(m['liquidation_density'] for m in markets) if markets else 1
+            metrics = MarketMetrics.from_markets(markets)
             
-            for market in markets:
-                # Normalize ATR (higher is better for volatility)
-                market['atr_normalized'] = (market['atr'] / max_atr) * 100
-                
-                # Technical score is already 0-100
-                market['technical_normalized'] = market['technical_score']
-                
-                # Normalize liquidation density
-                market['liquidation_normalized'] = (market['liquidation_density'] / max_liquidation) * 100
-                
-                # Calculate combined score
-                market['combined_score'] = (
-                    market['atr_normalized'] * 0.4 +
-                    market['technical_normalized'] * 0.4 +
-                    market['liquidation_normalized'] * 0.2
-                )
+            # Normalize scores (0-100) against all column maxima in one reduction
+            normalized = normalize_metrics(metrics.values)
+            atr_normalized = normalized[:, 0]
+            liquidation_normalized = normalized[:, 2]
             
-            # Sort by combined score
-            ranked_markets = sorted(markets, key=lambda x: x['combined_score'], reverse=True)
+            # Calculate combined score and order, partitioning out the top `limit` first
+            combined_score = combined_scores(metrics.values, normalized)
+            order = top_order(combined_score, limit)
+            
+            ranked_markets = []
+            for i in order:
+                market = markets[i]
+                market.update(
+                    atr_normalized=float(atr_normalized[i]),
+                    technical_normalized=market['technical_score'],
+                    liquidation_normalized=float(liquidation_normalized[i]),
+                    combined_score=float(combined_score[i])
+                )
+                ranked_markets.append(market)
             
             return ranked_markets
             
         except Exception as e:
-            print(f"Error ranking markets: {e}")
+            logger.error("Error ranking markets: %s", e)
             return markets
     
     def get_top_markets(self, limit: int = 30) -> List[Dict[str, Any]]:
@@ -331,20 +682,18 @@ class MarketScanner:
             # Scan and filter markets
             filtered_markets = self.scan_and_filter_markets()
             
-            # Rank markets
-            ranked_markets = self.rank_markets(filtered_markets)
-            
-            # Return top markets
-            top_markets = ranked_markets[:limit]
+            # Rank markets and keep the top ones
+            top_markets = self.rank_markets(filtered_markets, limit)[:limit]
             
-            print(f"Selected top {len(top_markets)} markets for trading")
-            for i, market in enumerate(top_markets):
-                print(f"{i+1}. {market['symbol']} - Score: {market['combined_score']:.2f}")
+            logger.info("Selected top %d markets for trading", len(top_markets))
+            if logger.isEnabledFor(logging.DEBUG):
+                for i, market in enumerate(top_markets):
+                    logger.debug("%d. %s - Score: %.2f", i + 1, market['symbol'], market['combined_score'])
             
             return top_markets
             
         except Exception as e:
-            print(f"Error getting top markets: {e}")
+            logger.error("Error getting top markets: %s", e)
             return []
     
     def get_markets(self) -> List[Dict[str, Any]]:
@@ -364,9 +713,11 @@ class MarketScanner:
         
         try:
             total_markets = len(markets)
-            avg_volume = sum(m['volume_24h'] for m in markets) / total_markets
-            avg_funding_rate = sum(m['funding_rate'] for m in markets) / total_markets
-            avg_spread = sum(m['spread'] for m in markets) / total_markets
+            avg_volume, avg_funding_rate, avg_spread = summary_averages(
+                [m['volume_24h'] for m in markets],
+                [m['funding_rate'] for m in markets],
+                [m['spread'] for m in markets]
+            )
             
             # Top symbols by score
             top_symbols = [(m['symbol'], m['combined_score']) for m in markets[:10]]
@@ -379,7 +730,7 @@ class MarketScanner:
                 'top_symbols': top_symbols
             }
         except Exception as e:
-            print(f"Error getting market summary: {e}")
+            logger.error("Error getting market summary: %s", e)
             return {
                 'total_markets': 0,
                 'avg_volume': 0,
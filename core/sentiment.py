@@ -1,26 +1,135 @@
 """
 Sentiment Analysis Module
-Uses free RSS feeds and TextBlob for sentiment analysis
+Uses free RSS feeds and VADER for sentiment analysis
 """
 
 import feedparser
+import hashlib
+import json
+import numpy as np
+import os
+import requests
 import time
 import re
-from typing import Dict, List, Any, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Set, Tuple
 from datetime import datetime, timedelta
-from textblob import TextBlob
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from .jit import njit
+
+_VADER = SentimentIntensityAnalyzer()
+
+@lru_cache(maxsize=4096)
+def _vader_compound(text: str) -> float:
+    """VADER compound score (-1 to 1), memoized on the raw text"""
+    return _VADER.polarity_scores(text)['compound']
+
+@njit(cache=True)
+def _leverage_adjustment(sentiment_score: float, volatility_score: float) -> float:
+    """Leverage from a 3x base scaled by sentiment and volatility, clamped to 1-5x"""
+    # Bullish sentiment increases leverage slightly, bearish decreases it
+    if sentiment_score > 0.3:
+        leverage_multiplier = 1.2
+    elif sentiment_score < -0.3:
+        leverage_multiplier = 0.8
+    else:
+        leverage_multiplier = 1.0
+    
+    # Higher event volatility decreases leverage
+    if volatility_score > 70:
+        volatility_multiplier = 0.7
+    elif volatility_score > 40:
+        volatility_multiplier = 0.9
+    else:
+        volatility_multiplier = 1.0
+    
+    adjusted_leverage = 3.0 * leverage_multiplier * volatility_multiplier
+    return round(max(1.0, min(5.0, adjusted_leverage)), 1)
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Base asset -> lowercase names used for it in headlines
+SYMBOL_ALIASES = {
+    'BTC': ('btc', 'bitcoin', 'xbt'),
+    'ETH': ('eth', 'ethereum', 'ether'),
+    'BNB': ('bnb', 'binance coin'),
+    'ADA': ('ada', 'cardano'),
+    'SOL': ('sol', 'solana'),
+    'XRP': ('xrp', 'ripple'),
+    'DOGE': ('doge', 'dogecoin'),
+    'DOT': ('polkadot',),
+    'AVAX': ('avax', 'avalanche'),
+    'LINK': ('chainlink',),
+    'LTC': ('ltc', 'litecoin'),
+    'MATIC': ('matic', 'polygon')
+}
+
+@dataclass
+class Article:
+    # Explicit __slots__ since runtime Python 3.9 lacks dataclass(slots=True)
+    __slots__ = ('title', 'summary', 'link', 'published', 'source')
+    title: str
+    summary: str
+    link: str
+    published: str
+    source: str
+
+class _LRUCache(OrderedDict):
+    """Dict that evicts its least recently used entry beyond maxsize"""
+    
+    def __init__(self, maxsize: int = 128):
+        super().__init__()
+        self.maxsize = maxsize
+    
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        self.move_to_end(key)
+        return super().__getitem__(key)
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
 
 class SentimentAnalyzer:
-    def __init__(self):
+    def __init__(self, cache_file_path: str = "logs/sentiment_cache.json"):
         # Free RSS feed URLs
         self.cryptopanic_rss = "https://cryptopanic.com/api/v1/posts/?auth_token=free&currencies=BTC,ETH,BNB&filter=hot"
         self.coindesk_rss = "https://www.coindesk.com/arc/outboundfeeds/rss/"
         self.cointelegraph_rss = "https://cointelegraph.com/rss"
         
-        # Cache for sentiment data
-        self.sentiment_cache = {}
+        # (url, source, article limit) for every feed polled
+        self.feeds = [
+            (self.cryptopanic_rss, 'CryptoPanic', 20),
+            (self.coindesk_rss, 'CoinDesk', 15),
+            (self.cointelegraph_rss, 'CoinTelegraph', 15)
+        ]
+        
+        # Conditional-GET validators, body hash and last article list per feed URL
+        self._feed_meta = {}
+        
+        # Shared keep-alive session so feed polls reuse TCP/TLS connections
+        self._session = requests.Session()
+        self._session.headers['User-Agent'] = 'scalp-bot/1.0'
+        self.feed_timeout = 5
+        
+        # Cache for sentiment data, bounded so per-symbol entries cannot grow forever
+        self.sentiment_cache = _LRUCache(maxsize=128)
         self.cache_expiry = 300  # 5 minutes
         
+        # Last analyzed batch is persisted so restarts start warm
+        self.cache_file_path = cache_file_path
+        self._load_persisted_batch()
+        
         # Keywords for volatility detection
         self.volatility_keywords = [
             'crash', 'dump', 'pump', 'surge', 'rally', 'moon', 'rocket',
@@ -42,107 +151,177 @@ class SentimentAnalyzer:
             'breakdown', 'distribution', 'selling', 'fud', 'panic',
             'regulation', 'ban', 'negative', 'losses', 'decline'
         ]
+        
+        # Keyword/alias table scanned by a single automaton, or word by word when
+        # pyahocorasick is unavailable
+        self._keyword_table = self._build_keyword_table()
+        self._keyword_automaton = self._build_keyword_automaton()
+        
+        # Text shorter than the shortest keyword or alias cannot match anything
+        self._min_match_length = min(len(word) for word in self._keyword_table)
     
-    def fetch_cryptopanic_rss(self) -> List[Dict[str, Any]]:
-        """Fetch news from CryptoPanic RSS feed (free)"""
-        try:
-            feed = feedparser.parse(self.cryptopanic_rss)
-            articles = []
-            
-            for entry in feed.entries[:20]:  # Get latest 20 articles
-                article = {
-                    'title': entry.get('title', ''),
-                    'summary': entry.get('summary', ''),
-                    'link': entry.get('link', ''),
-                    'published': entry.get('published', ''),
-                    'source': 'CryptoPanic'
-                }
-                articles.append(article)
-            
-            return articles
-        except Exception as e:
-            print(f"Error fetching CryptoPanic RSS: {e}")
-            return []
+    def _build_keyword_table(self) -> Dict[str, Tuple[Tuple[str, ...], Optional[str]]]:
+        """Map each keyword or ticker alias to its categories and symbol (None for plain keywords)"""
+        categories: Dict[str, List[str]] = {}
+        for category, keywords in (('volatility', self.volatility_keywords),
+                                   ('bullish', self.bullish_keywords),
+                                   ('bearish', self.bearish_keywords)):
+            for keyword in keywords:
+                categories.setdefault(keyword, []).append(category)
+        
+        words = {keyword: (tuple(keyword_categories), None) for keyword, keyword_categories in categories.items()}
+        for symbol, aliases in SYMBOL_ALIASES.items():
+            for alias in aliases:
+                keyword_categories = words.get(alias, ((), None))[0]
+                words[alias] = (keyword_categories, symbol)
+        return words
     
-    def fetch_coindesk_rss(self) -> List[Dict[str, Any]]:
-        """Fetch news from CoinDesk RSS feed (free)"""
-        try:
-            feed = feedparser.parse(self.coindesk_rss)
-            articles = []
-            
-            for entry in feed.entries[:15]:  # Get latest 15 articles
-                article = {
-                    'title': entry.get('title', ''),
-                    'summary': entry.get('summary', ''),
-                    'link': entry.get('link', ''),
-                    'published': entry.get('published', ''),
-                    'source': 'CoinDesk'
-                }
-                articles.append(article)
-            
-            return articles
-        except Exception as e:
-            print(f"Error fetching CoinDesk RSS: {e}")
-            return []
+    def _build_keyword_automaton(self):
+        """Build an Aho-Corasick automaton over the keyword table"""
+        if ahocorasick is None:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for word, (keyword_categories, symbol) in self._keyword_table.items():
+            automaton.add_word(word, (word, keyword_categories, symbol))
+        automaton.make_automaton()
+        return automaton
+    
+    @staticmethod
+    def _stands_alone(text: str, start: int, end: int) -> bool:
+        """Whether text[start:end + 1] has no letter or digit directly on either side"""
+        before = text[start - 1] if start > 0 else ' '
+        after = text[end + 1] if end + 1 < len(text) else ' '
+        return not before.isalnum() and not after.isalnum()
+    
+    def _scan_text(self, text_lower: str) -> Tuple[Dict[str, int], Set[str]]:
+        """Count distinct volatility/bullish/bearish keywords and collect mentioned symbols"""
+        counts = {'volatility': 0, 'bullish': 0, 'bearish': 0}
+        symbols = set()
+        
+        if len(text_lower) < self._min_match_length:
+            return counts, symbols
+        
+        if self._keyword_automaton is None:
+            # Substring check per table word, matching what the automaton reports
+            for word, (keyword_categories, symbol) in self._keyword_table.items():
+                start = text_lower.find(word)
+                if start < 0:
+                    continue
+                for category in keyword_categories:
+                    counts[category] += 1
+                while symbol is not None and start >= 0:
+                    if self._stands_alone(text_lower, start, start + len(word) - 1):
+                        symbols.add(symbol)
+                        break
+                    start = text_lower.find(word, start + 1)
+            return counts, symbols
+        
+        # One pass over the text; each keyword counts once, as with substring checks
+        seen = set()
+        for end, (word, keyword_categories, symbol) in self._keyword_automaton.iter(text_lower):
+            # Aliases must stand alone ('sol' in 'solution' is not Solana)
+            if symbol is not None and symbol not in symbols and \
+                    self._stands_alone(text_lower, end - len(word) + 1, end):
+                symbols.add(symbol)
+            if word in seen:
+                continue
+            seen.add(word)
+            for category in keyword_categories:
+                counts[category] += 1
+        return counts, symbols
+    
+    def _conditional_headers(self, url: str) -> Dict[str, str]:
+        """Conditional-GET validators remembered from the last response for url"""
+        meta = self._feed_meta.get(url, {})
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('modified'):
+            headers['If-Modified-Since'] = meta['modified']
+        return headers
+    
+    def _articles_from_response(self, url: str, source: str, limit: int, status: int,
+                                headers: Any, content: bytes) -> List[Article]:
+        """Turn a feed response body into articles, reusing the last list on 304 or an identical body"""
+        meta = self._feed_meta.get(url, {})
+        
+        # Unchanged upstream: reuse the articles parsed last time
+        if status == 304 and 'articles' in meta:
+            return meta['articles']
+        
+        # Servers that ignore conditional GETs still resend identical bodies; skip the parse
+        body_hash = hashlib.blake2b(content, digest_size=16).digest()
+        if body_hash == meta.get('body_hash') and 'articles' in meta:
+            meta['etag'] = headers.get('ETag')
+            meta['modified'] = headers.get('Last-Modified')
+            return meta['articles']
+        
+        feed = feedparser.parse(content)
+        articles = [
+            Article(
+                entry.get('title', ''),
+                entry.get('summary', ''),
+                entry.get('link', ''),
+                entry.get('published', ''),
+                source
+            )
+            for entry in feed.entries[:limit]
+        ]
+        
+        self._feed_meta[url] = {
+            'etag': headers.get('ETag'),
+            'modified': headers.get('Last-Modified'),
+            'body_hash': body_hash,
+            'articles': articles
+        }
+        return articles
     
-    def fetch_cointelegraph_rss(self) -> List[Dict[str, Any]]:
-        """Fetch news from CoinTelegraph RSS feed (free)"""
+    def _fetch_feed(self, url: str, source: str, limit: int) -> List[Article]:
+        """Fetch the latest `limit` articles from an RSS feed (free)"""
         try:
-            feed = feedparser.parse(self.cointelegraph_rss)
-            articles = []
-            
-            for entry in feed.entries[:15]:  # Get latest 15 articles
-                article = {
-                    'title': entry.get('title', ''),
-                    'summary': entry.get('summary', ''),
-                    'link': entry.get('link', ''),
-                    'published': entry.get('published', ''),
-                    'source': 'CoinTelegraph'
-                }
-                articles.append(article)
-            
-            return articles
+            response = self._session.get(url, headers=self._conditional_headers(url), timeout=self.feed_timeout)
+            response.raise_for_status()
+            return self._articles_from_response(url, source, limit, response.status_code,
+                                                response.headers, response.content)
         except Exception as e:
-            print(f"Error fetching CoinTelegraph RSS: {e}")
+            print(f"Error fetching {source} RSS: {e}")
             return []
     
     def analyze_text_sentiment(self, text: str) -> Dict[str, float]:
-        """Analyze sentiment using TextBlob (free)"""
+        """Analyze sentiment using VADER (free, lexicon-only)"""
         try:
-            # Clean text
-            clean_text = re.sub(r'[^\w\s]', '', text.lower())
-            
-            # Create TextBlob object
-            blob = TextBlob(clean_text)
+            if not text.strip():
+                return {'polarity': 0, 'confidence': 0}
             
-            # Get polarity (-1 to 1) and subjectivity (0 to 1)
-            sentiment: Any = blob.sentiment
-            polarity = sentiment.polarity
-            subjectivity = sentiment.subjectivity
-            
-            # Calculate confidence based on subjectivity
-            confidence = 1 - subjectivity if subjectivity > 0 else 1
+            # VADER reads case and punctuation as intensity cues, so the text is not cleaned;
+            # republished headlines hit the cache
+            polarity = _vader_compound(text)
             
+            # Confidence is the strength of the compound score
             return {
                 'polarity': polarity,
-                'subjectivity': subjectivity,
-                'confidence': confidence
+                'confidence': abs(polarity)
             }
         except Exception as e:
             print(f"Error analyzing text sentiment: {e}")
-            return {'polarity': 0, 'subjectivity': 0.5, 'confidence': 0}
+            return {'polarity': 0, 'confidence': 0}
     
     def detect_volatility_keywords(self, text: str) -> Dict[str, Any]:
         """Detect volatility-related keywords in text"""
         try:
-            text_lower = text.lower()
-            
-            # Count volatility keywords
-            volatility_count = sum(1 for keyword in self.volatility_keywords if keyword in text_lower)
-            
-            # Count bullish/bearish keywords
-            bullish_count = sum(1 for keyword in self.bullish_keywords if keyword in text_lower)
-            bearish_count = sum(1 for keyword in self.bearish_keywords if keyword in text_lower)
+            counts, _ = self._scan_text(text.lower())
+            return self._volatility_from_counts(counts)
+        except Exception as e:
+            print(f"Error detecting volatility keywords: {e}")
+            return self._volatility_from_counts({'volatility': 0, 'bullish': 0, 'bearish': 0})
+    
+    def _volatility_from_counts(self, counts: Dict[str, int]) -> Dict[str, Any]:
+        """Derive volatility score and sentiment bias from keyword counts"""
+        try:
+            volatility_count = counts['volatility']
+            bullish_count = counts['bullish']
+            bearish_count = counts['bearish']
             
             # Calculate volatility score (0-100)
             volatility_score = min(100, volatility_count * 10)
@@ -177,136 +356,235 @@ class SentimentAnalyzer:
                 'bearish_count': 0
             }
     
-    def analyze_article_sentiment(self, article: Dict[str, Any]) -> Dict[str, Any]:
+    def analyze_article_sentiment(self, article: Article) -> Dict[str, Any]:
         """Analyze sentiment of a single article"""
         try:
+            # Nothing to analyze; the batch drops empty results
+            if not article.title and not article.summary:
+                return {}
+            
             # Combine title and summary
-            text = f"{article.get('title', '')} {article.get('summary', '')}"
+            text = f"{article.title} {article.summary}"
             
-            # Analyze sentiment
+            # Analyze sentiment; keywords and symbol mentions come from one scan
             sentiment = self.analyze_text_sentiment(text)
-            volatility = self.detect_volatility_keywords(text)
+            counts, symbols = self._scan_text(text.lower())
+            volatility = self._volatility_from_counts(counts)
             
             return {
-                'title': article.get('title', ''),
-                'source': article.get('source', ''),
+                'title': article.title,
+                'source': article.source,
                 'sentiment': sentiment,
                 'volatility': volatility,
-                'timestamp': datetime.now().isoformat()
+                'symbols': sorted(symbols),
+                # Epoch seconds; serialized only for the articles a summary returns
+                'analyzed_at': time.time()
             }
         except Exception as e:
             print(f"Error analyzing article sentiment: {e}")
             return {}
     
-    def get_market_sentiment(self, symbol: Optional[str] = None) -> Dict[str, Any]:
-        """Get overall market sentiment from multiple sources"""
+    def _load_persisted_batch(self):
+        """Seed the analysis cache from the batch saved by a previous run"""
         try:
-            # Check cache
-            cache_key = f"sentiment_{symbol or 'market'}"
-            if cache_key in self.sentiment_cache:
-                cached_data = self.sentiment_cache[cache_key]
-                if datetime.now().timestamp() - cached_data['timestamp'] < self.cache_expiry:
-                    return cached_data['data']
-            
-            # Fetch news from multiple sources
-            articles = []
-            articles.extend(self.fetch_cryptopanic_rss())
-            articles.extend(self.fetch_coindesk_rss())
-            articles.extend(self.fetch_cointelegraph_rss())
-            
-            if not articles:
-                return self._get_default_sentiment()
-            
-            # Analyze sentiment for each article
-            analyzed_articles = []
-            total_polarity = 0
-            total_subjectivity = 0
-            total_volatility = 0
-            total_bullish = 0
-            total_bearish = 0
-            
-            for article in articles:
-                analysis = self.analyze_article_sentiment(article)
-                if analysis:
-                    analyzed_articles.append(analysis)
-                    
-                    # Aggregate scores
-                    total_polarity += analysis['sentiment']['polarity']
-                    total_subjectivity += analysis['sentiment']['subjectivity']
-                    total_volatility += analysis['volatility']['volatility_score']
-                    total_bullish += analysis['volatility']['bullish_count']
-                    total_bearish += analysis['volatility']['bearish_count']
-            
-            if not analyzed_articles:
-                return self._get_default_sentiment()
-            
-            # Calculate averages
-            num_articles = len(analyzed_articles)
-            avg_polarity = total_polarity / num_articles
-            avg_subjectivity = total_subjectivity / num_articles
-            avg_volatility = total_volatility / num_articles
-            
-            # Determine overall sentiment
-            if avg_polarity > 0.1:
-                overall_sentiment = 'bullish'
-                sentiment_score = min(1.0, avg_polarity * 2)
-            elif avg_polarity < -0.1:
-                overall_sentiment = 'bearish'
-                sentiment_score = max(-1.0, avg_polarity * 2)
-            else:
-                overall_sentiment = 'neutral'
-                sentiment_score = 0
-            
-            # Calculate event volatility score
-            event_volatility_score = min(100, avg_volatility)
-            
-            # Determine market mood
-            if event_volatility_score > 70:
-                market_mood = 'high_volatility'
-            elif event_volatility_score > 40:
-                market_mood = 'moderate_volatility'
-            else:
-                market_mood = 'low_volatility'
-            
-            # Create sentiment summary
-            sentiment_data = {
-                'overall_sentiment': overall_sentiment,
-                'sentiment_score': sentiment_score,
-                'event_volatility_score': event_volatility_score,
-                'market_mood': market_mood,
-                'avg_polarity': avg_polarity,
-                'avg_subjectivity': avg_subjectivity,
-                'total_articles': num_articles,
-                'bullish_articles': total_bullish,
-                'bearish_articles': total_bearish,
-                'analyzed_articles': analyzed_articles[:5],  # Top 5 articles
-                'timestamp': datetime.now().isoformat()
+            if not os.path.exists(self.cache_file_path):
+                return
+            with open(self.cache_file_path, 'r') as f:
+                saved = json.load(f)
+            
+            # Map the wall-clock save time onto the monotonic clock; an expired batch
+            # is still kept so an unchanged feed skips re-analysis
+            age = min(max(time.time() - saved['saved_at'], 0), self.cache_expiry)
+            self.sentiment_cache['analysis_batch'] = {
+                'hash': saved['hash'],
+                'data': saved['data'],
+                'timestamp': time.monotonic() - age
             }
-            
-            # Cache the result
-            self.sentiment_cache[cache_key] = {
-                'data': sentiment_data,
-                'timestamp': datetime.now().timestamp()
+        except Exception as e:
+            print(f"Error loading sentiment cache: {e}")
+    
+    def _persist_batch(self, content_hash: str, analyzed_articles: List[Dict[str, Any]]):
+        """Write the analyzed batch to disk atomically"""
+        try:
+            os.makedirs(os.path.dirname(self.cache_file_path) or '.', exist_ok=True)
+            tmp_path = f"{self.cache_file_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({'hash': content_hash, 'data': analyzed_articles, 'saved_at': time.time()}, f)
+            os.replace(tmp_path, self.cache_file_path)
+        except Exception as e:
+            print(f"Error saving sentiment cache: {e}")
+    
+    def _fetch_all_articles(self) -> List[Article]:
+        """Fetch news from all feeds concurrently"""
+        articles = []
+        with ThreadPoolExecutor(max_workers=len(self.feeds)) as executor:
+            for feed_articles in executor.map(lambda feed: self._fetch_feed(*feed), self.feeds):
+                articles.extend(feed_articles)
+        return articles
+    
+    def _content_hash(self, articles: List[Article]) -> str:
+        """Stable digest of the article texts fed into the analysis"""
+        digest = hashlib.blake2b(digest_size=16)
+        for article in articles:
+            digest.update(article.title.encode())
+            digest.update(b'\x1f')
+            digest.update(article.summary.encode())
+            digest.update(b'\x1e')
+        return digest.hexdigest()
+    
+    def _fresh_batch(self) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+        """Cached (content hash, analyses) if still within the cache expiry"""
+        cached = self.sentiment_cache.get('analysis_batch')
+        if cached and time.monotonic() - cached['timestamp'] < self.cache_expiry:
+            return cached['hash'], cached['data']
+        return None
+    
+    def _analyze_batch(self, articles: List[Article]) -> Tuple[str, List[Dict[str, Any]]]:
+        """Analyze a fetched batch unless its content matches the cached one"""
+        content_hash = self._content_hash(articles)
+        
+        # Feeds unchanged since the last analysis: only refresh the TTL
+        cached = self.sentiment_cache.get('analysis_batch')
+        if cached and cached['hash'] == content_hash:
+            cached['timestamp'] = time.monotonic()
+            return content_hash, cached['data']
+        
+        analyzed_articles = []
+        for article in articles:
+            analysis = self.analyze_article_sentiment(article)
+            if analysis:
+                analyzed_articles.append(analysis)
+        
+        if analyzed_articles:
+            self.sentiment_cache['analysis_batch'] = {
+                'hash': content_hash,
+                'data': analyzed_articles,
+                'timestamp': time.monotonic()
             }
-            
-            return sentiment_data
-            
+            self._persist_batch(content_hash, analyzed_articles)
+        return content_hash, analyzed_articles
+    
+    def _analyze_all_articles(self) -> Tuple[str, List[Dict[str, Any]]]:
+        """Analyze every fetched article once per feed content; returns (content hash, analyses)"""
+        return self._fresh_batch() or self._analyze_batch(self._fetch_all_articles())
+    
+    def _summarize_articles(self, analyzed_articles: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Aggregate analyzed articles into a sentiment summary"""
+        if not analyzed_articles:
+            return self._get_default_sentiment()
+        
+        # Collect per-article metrics into preallocated arrays
+        num_articles = len(analyzed_articles)
+        polarity = np.empty(num_articles)
+        volatility = np.empty(num_articles)
+        bullish = np.empty(num_articles, dtype=np.int64)
+        bearish = np.empty(num_articles, dtype=np.int64)
+        
+        for i, analysis in enumerate(analyzed_articles):
+            article_sentiment = analysis['sentiment']
+            article_volatility = analysis['volatility']
+            polarity[i] = article_sentiment['polarity']
+            volatility[i] = article_volatility['volatility_score']
+            bullish[i] = article_volatility['bullish_count']
+            bearish[i] = article_volatility['bearish_count']
+        
+        # Calculate averages
+        avg_polarity = float(polarity.mean())
+        avg_volatility = float(volatility.mean())
+        total_bullish = int(bullish.sum())
+        total_bearish = int(bearish.sum())
+        
+        # Determine overall sentiment
+        if avg_polarity > 0.1:
+            overall_sentiment = 'bullish'
+            sentiment_score = min(1.0, avg_polarity * 2)
+        elif avg_polarity < -0.1:
+            overall_sentiment = 'bearish'
+            sentiment_score = max(-1.0, avg_polarity * 2)
+        else:
+            overall_sentiment = 'neutral'
+            sentiment_score = 0
+        
+        # Calculate event volatility score
+        event_volatility_score = min(100, avg_volatility)
+        
+        # Determine market mood
+        if event_volatility_score > 70:
+            market_mood = 'high_volatility'
+        elif event_volatility_score > 40:
+            market_mood = 'moderate_volatility'
+        else:
+            market_mood = 'low_volatility'
+        
+        # Create sentiment summary
+        return {
+            'overall_sentiment': overall_sentiment,
+            'sentiment_score': sentiment_score,
+            'event_volatility_score': event_volatility_score,
+            'market_mood': market_mood,
+            'avg_polarity': avg_polarity,
+            'total_articles': num_articles,
+            'bullish_articles': total_bullish,
+            'bearish_articles': total_bearish,
+            'analyzed_articles': [self._serialize_article(a) for a in analyzed_articles[:5]],  # Top 5 articles
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    def _serialize_article(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Article analysis with its timestamp rendered for display"""
+        article = {k: v for k, v in analysis.items() if k != 'analyzed_at'}
+        article['timestamp'] = datetime.fromtimestamp(analysis['analyzed_at']).isoformat()
+        return article
+    
+    def get_market_sentiment(self, symbol: Optional[str] = None) -> Dict[str, Any]:
+        """Get overall market sentiment from multiple sources"""
+        try:
+            return self._market_sentiment(*self._analyze_all_articles())
         except Exception as e:
             print(f"Error getting market sentiment: {e}")
             return self._get_default_sentiment()
     
+    def _market_sentiment(self, content_hash: str, analyzed_articles: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Market summary of an analyzed batch, cached on its content hash"""
+        # The summary only changes when the analyzed feed content does
+        cached = self.sentiment_cache.get('sentiment_market')
+        if cached and cached['hash'] == content_hash:
+            return cached['data']
+        
+        sentiment_data = self._summarize_articles(analyzed_articles)
+        if analyzed_articles:
+            self.sentiment_cache['sentiment_market'] = {
+                'hash': content_hash,
+                'data': sentiment_data
+            }
+        return sentiment_data
+    
     def get_symbol_sentiment(self, symbol: str) -> Dict[str, Any]:
         """Get sentiment specific to a symbol"""
         try:
-            # For now, use general market sentiment
-            # In a more advanced implementation, you could filter articles by symbol
-            market_sentiment = self.get_market_sentiment()
-            
-            # Add symbol-specific information
-            symbol_sentiment = market_sentiment.copy()
+            base = symbol.split('/')[0].split(':')[0].upper()
+            if base.endswith('USDT') and len(base) > 4:
+                base = base[:-4]
+            
+            content_hash, analyzed_articles = self._analyze_all_articles()
+            cache_key = f"sentiment_{base}"
+            cached = self.sentiment_cache.get(cache_key)
+            if cached and cached['hash'] == content_hash:
+                symbol_sentiment = cached['data']
+            else:
+                mentions = [a for a in analyzed_articles if base in a.get('symbols', ())]
+                if mentions:
+                    symbol_sentiment = self._summarize_articles(mentions)
+                    symbol_sentiment['symbol_specific'] = True
+                else:
+                    # No article mentions the symbol; fall back to general market sentiment
+                    symbol_sentiment = self.get_market_sentiment().copy()
+                    symbol_sentiment['symbol_specific'] = False
+                if analyzed_articles:
+                    self.sentiment_cache[cache_key] = {'hash': content_hash, 'data': symbol_sentiment}
+            
+            symbol_sentiment = symbol_sentiment.copy()
             symbol_sentiment['symbol'] = symbol
-            symbol_sentiment['symbol_specific'] = False  # Indicates this is general sentiment
-            
             return symbol_sentiment
             
         except Exception as e:
@@ -321,7 +599,6 @@ class SentimentAnalyzer:
             'event_volatility_score': 25,
             'market_mood': 'low_volatility',
             'avg_polarity': 0,
-            'avg_subjectivity': 0.5,
             'total_articles': 0,
             'bullish_articles': 0,
             'bearish_articles': 0,
@@ -332,41 +609,9 @@ class SentimentAnalyzer:
     def calculate_leverage_adjustment(self, sentiment_data: Dict[str, Any]) -> float:
         """Calculate leverage adjustment based on sentiment"""
         try:
-            sentiment_score = sentiment_data.get('sentiment_score', 0)
-            volatility_score = sentiment_data.get('event_volatility_score', 25)
-            
-            # Base leverage
-            base_leverage = 3.0
-            
-            # Adjust based on sentiment
-            if sentiment_score > 0.3:
-                # Bullish sentiment - increase leverage slightly
-                leverage_multiplier = 1.2
-            elif sentiment_score < -0.3:
-                # Bearish sentiment - decrease leverage
-                leverage_multiplier = 0.8
-            else:
-                # Neutral sentiment
-                leverage_multiplier = 1.0
-            
-            # Adjust based on volatility
-            if volatility_score > 70:
-                # High volatility - decrease leverage
-                volatility_multiplier = 0.7
-            elif volatility_score > 40:
-                # Moderate volatility - slight decrease
-                volatility_multiplier = 0.9
-            else:
-                # Low volatility - normal leverage
-                volatility_multiplier = 1.0
-            
-            # Calculate final leverage
-            adjusted_leverage = base_leverage * leverage_multiplier * volatility_multiplier
-            
-            # Ensure leverage is within reasonable bounds
-            adjusted_leverage = max(1.0, min(5.0, adjusted_leverage))
-            
-            return round(adjusted_leverage, 1)
+            sentiment_score = float(sentiment_data.get('sentiment_score', 0))
+            volatility_score = float(sentiment_data.get('event_volatility_score', 25))
+            return _leverage_adjustment(sentiment_score, volatility_score)
             
         except Exception as e:
             print(f"Error calculating leverage adjustment: {e}")
@@ -377,6 +622,7 @@ class SentimentAnalyzer:
         try:
             sentiment_summary = {}
             
+            # The article batch is analyzed once; each symbol is a projection of it
             for symbol in symbols:
                 sentiment = self.get_symbol_sentiment(symbol)
                 sentiment_summary[symbol] = {
@@ -3,15 +3,17 @@ Signal Engine Module
 Orchestrates market scanning, signal generation, and validation using multiple strategies
 """
 
-import time
+import logging
 import threading
+from collections import deque
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from dataclasses import asdict
 
 from .scanner import MarketScanner
+from .market_bundle import MarketBundle
 from .indicators import TechnicalIndicators
 from .sentiment import SentimentAnalyzer
 from .liquidation import LiquidationAnalyzer
@@ -25,6 +27,22 @@ from .strategy_trap import TrapTradingStrategy, TrapSignal
 from .strategy_smc import SMCStrategy, SMCSignal
 from .strategy_scalp import ScalpingStrategy, ScalpSignal
 
+logger = logging.getLogger(__name__)
+# Silent unless the application configures logging
+logger.addHandler(logging.NullHandler())
+
+
+def _pad(values: np.ndarray, n: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Right-align an indicator series in a length-n row; the warm-up head is NaN, not a fake 0"""
+    if out is None:
+        out = np.empty(n, dtype=np.float64)
+    k = min(len(values), n)
+    out[:n - k] = np.nan
+    if k:
+        out[n - k:] = values[-k:]
+    return out
+
+
 class SignalEngine:
     def __init__(self):
         self.scanner = MarketScanner()
@@ -47,10 +65,32 @@ class SignalEngine:
         self.max_daily_signals = 30
         self.cooldown_minutes = 15
         
+        # Strategy weights per regime bucket; shared read-only dicts
+        self._strategy_weights = (
+            {'SMC': 0.6, 'Trap': 0.3, 'Scalp': 0.1},  # Strong trending, high volatility - favor SMC
+            {'Scalp': 0.7, 'Trap': 0.3, 'SMC': 0.0},  # Weak trending - favor Scalping
+            {'SMC': 0.4, 'Trap': 0.3, 'Scalp': 0.3}   # Moderate market - balanced approach
+        )
+        
         # Signal tracking
         self.daily_signals = 0
         self.last_signal_time = {}
-        self.signal_history = []
+        self.history_size = 1000
+        self.signal_history = deque(maxlen=self.history_size)
+        # Signal times in append order (sorted), parallel to signal_history
+        self._signal_ts = np.empty(0, dtype='datetime64[s]')
+        
+        # Markets are processed concurrently; the lock guards counters, history and the log file
+        self.max_workers = 6
+        self._state_lock = threading.Lock()
+        
+        # One long-lived pool for per-market work instead of a fresh executor per scan
+        self._market_pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                               thread_name_prefix="signal-markets")
+        
+        # Prepared data and regime per symbol, reused until a new bar arrives
+        self._data_cache = {}
+        self._regime_cache = {}
     
     @property
     def risk_manager(self):
@@ -67,97 +107,111 @@ class SignalEngine:
     def scan_markets(self) -> List[Dict[str, Any]]:
         """Scan and filter markets"""
         try:
-            print("🔍 Scanning markets...")
+            logger.info("Scanning markets...")
             markets = self.scanner.scan_and_filter_markets()
             
             if not markets:
-                print("⚠ No markets found")
+                logger.warning("No markets found")
                 return []
             
             # Select top markets for trading
             top_markets = sorted(markets, key=lambda x: x.get('technical_score', 0), reverse=True)[:6]
             
-            print(f"✅ Found {len(top_markets)} top markets")
-            for i, market in enumerate(top_markets, 1):
-                symbol = market['symbol']
-                score = market.get('technical_score', 0)
-                print(f"{i}. {symbol} - Score: {score:.2f}")
+            logger.info("Found %d top markets", len(top_markets))
+            if logger.isEnabledFor(logging.DEBUG):
+                for i, market in enumerate(top_markets, 1):
+                    logger.debug("%d. %s - Score: %.2f", i, market['symbol'], market.get('technical_score', 0))
             
             return top_markets
             
         except Exception as e:
-            print(f"❌ Error scanning markets: {e}")
+            logger.error("Error scanning markets: %s", e)
             return []
     
-    def prepare_market_data(self, symbol: str, market_data: Dict[str, Any]) -> pd.DataFrame:
+    def _fetch_ohlcv(self, symbol: str) -> Optional[List]:
+        """Fetch the 1h OHLCV window used for strategy analysis"""
+        # Normalize symbol for OHLCV fetch (remove :... suffix)
+        normalized_symbol = symbol.split(':')[0] if ':' in symbol else symbol
+        return self.indicators.get_ohlcv_data(normalized_symbol, '1h', 100)
+    
+    def prepare_market_data(self, symbol: str, market_data: Dict[str, Any],
+                            ohlcv: Optional[List] = None) -> MarketBundle:
         """Prepare market data for strategy analysis"""
         try:
-            # Normalize symbol for OHLCV fetch (remove :... suffix)
-            normalized_symbol = symbol.split(':')[0] if ':' in symbol else symbol
-            
-            # Get OHLCV data
-            ohlcv = self.indicators.get_ohlcv_data(normalized_symbol, '1h', 100)
+            # Fetch OHLCV unless the caller supplied bars (warmup passes synthetic ones)
+            if ohlcv is None:
+                ohlcv = self._fetch_ohlcv(symbol)
             if not ohlcv:
-                print(f"⚠ No OHLCV data for {symbol}")
-                return pd.DataFrame()
+                logger.warning("No OHLCV data for %s", symbol)
+                return MarketBundle.empty_bundle(symbol)
+            
+            # The last bar is still forming, so reuse indicators only while its whole row is unchanged
+            last_bar = tuple(ohlcv[-1])
+            cached = self._data_cache.get(symbol)
+            if cached and cached[0] == last_bar:
+                return cached[1]
             
-            # Convert to DataFrame
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['symbol'] = symbol  # Add symbol to DataFrame
+            # Convert to one float64 array for the indicator calculations
+            ohlcv = np.asarray(ohlcv, dtype=np.float64)
             
-            # Get close prices as list
-            close_prices = df['close'].tolist()
+            # Close prices as a column view, no per-element boxing
+            close_prices = ohlcv[:, 4]
             
-            # Calculate technical indicators with proper padding
-            # EMA indicators
+            # Calculate technical indicators
             ema_9_values = self.indicators.calculate_ema(close_prices, 9)
             ema_21_values = self.indicators.calculate_ema(close_prices, 21)
             ema_20_values = self.indicators.calculate_ema(close_prices, 20)
             ema_50_values = self.indicators.calculate_ema(close_prices, 50)
-            
-            # Pad EMA values to match DataFrame length
-            df['ema_9'] = [0] * (len(df) - len(ema_9_values)) + ema_9_values
-            df['ema_21'] = [0] * (len(df) - len(ema_21_values)) + ema_21_values
-            df['ema_20'] = [0] * (len(df) - len(ema_20_values)) + ema_20_values
-            df['ema_50'] = [0] * (len(df) - len(ema_50_values)) + ema_50_values
-            
-            # MACD
             macd_data = self.indicators.calculate_macd(close_prices)
-            if macd_data and macd_data['macd'] and macd_data['signal']:
-                # Pad MACD values to match DataFrame length
-                df['macd'] = [0] * (len(df) - len(macd_data['macd'])) + macd_data['macd']
-                df['macd_signal'] = [0] * (len(df) - len(macd_data['signal'])) + macd_data['signal']
-            else:
-                df['macd'] = [0] * len(df)
-                df['macd_signal'] = [0] * len(df)
-            
-            # RSI
             rsi_values = self.indicators.calculate_rsi(close_prices)
-            # Pad RSI values to match DataFrame length
-            df['rsi'] = [0] * (len(df) - len(rsi_values)) + rsi_values
-            
-            # VWAP
             vwap_values = self.indicators.calculate_vwap(ohlcv)
-            # Pad VWAP values to match DataFrame length
-            df['vwap'] = [0] * (len(df) - len(vwap_values)) + vwap_values
-            
-            # ATR
             atr_values = self.indicators.calculate_atr(ohlcv)
-            # Pad ATR values to match DataFrame length
-            df['atr'] = [0] * (len(df) - len(atr_values)) + atr_values
-            
-            # ADX
             adx_values = self.indicators.calculate_adx(ohlcv)
-            # Pad ADX values to match DataFrame length
-            df['adx'] = [0] * (len(df) - len(adx_values)) + adx_values
             
-            return df
+            indicator_values = {
+                'ema_9': ema_9_values,
+                'ema_21': ema_21_values,
+                'ema_20': ema_20_values,
+                'ema_50': ema_50_values,
+                'macd': macd_data['macd'],
+                'macd_signal': macd_data['signal'],
+                'rsi': rsi_values,
+                'vwap': vwap_values,
+                'atr': atr_values,
+                'adx': adx_values
+            }
+            
+            # Padded indicator block, one contiguous row per indicator, filled in place
+            n = len(ohlcv)
+            block = np.empty((len(indicator_values), n), dtype=np.float64)
+            for row, values in enumerate(indicator_values.values()):
+                _pad(values, n, block[row])
+            
+            data = MarketBundle.from_arrays(symbol, ohlcv, dict(zip(indicator_values, block)))
+            self._data_cache[symbol] = (last_bar, data)
+            return data
             
         except Exception as e:
-            print(f"❌ Error preparing market data for {symbol}: {e}")
-            import traceback
-            traceback.print_exc()
-            return pd.DataFrame()
+            logger.error("Error preparing market data for %s: %s", symbol, e)
+            logger.debug("Traceback for %s", symbol, exc_info=True)
+            return MarketBundle.empty_bundle(symbol)
+    
+    def warmup(self):
+        """Run the compiled indicator and strategy kernels once on synthetic bars"""
+        # numba compiles (or loads from its on-disk cache) on first call; do it at boot, not in the first scan
+        try:
+            t = np.arange(100, dtype=np.float64)
+            close = 100 + np.sin(t / 5)
+            ohlcv = np.column_stack((t * 3600000, close, close + 0.5, close - 0.5, close, np.full(100, 1000.0)))
+            data = self.prepare_market_data('WARMUP', {}, ohlcv.tolist())
+            self._data_cache.pop('WARMUP', None)
+            
+            self.scalp_strategy.validate_scalping_setup(data)
+            self.scalp_strategy.calculate_scalp_targets(100.0, 1.0, 'LONG')
+            self.smc_strategy.validate_smc_setup(data)
+            self.sentiment.calculate_leverage_adjustment({})
+        except Exception as e:
+            logger.warning("JIT warmup failed: %s", e)
     
     def get_strategy_weights(self, market_regime: Dict[str, Any]) -> Dict[str, float]:
         """Calculate strategy weights based on market regime"""
@@ -165,23 +219,17 @@ class SignalEngine:
             adx_value = market_regime.get('adx_value', 20)
             volatility_rank = market_regime.get('volatility_rank', 50)
             
-            if adx_value > 25 and volatility_rank > 80:
-                # Strong trending, high volatility market - favor SMC
-                return {'SMC': 0.6, 'Trap': 0.3, 'Scalp': 0.1}
-            elif adx_value < 20:
-                # Weak trending market - favor Scalping
-                return {'Scalp': 0.7, 'Trap': 0.3, 'SMC': 0.0}
-            else:
-                # Moderate market - balanced approach
-                return {'SMC': 0.4, 'Trap': 0.3, 'Scalp': 0.3}
+            bucket = 0 if (adx_value > 25 and volatility_rank > 80) else (1 if adx_value < 20 else 2)
+            return self._strategy_weights[bucket]
                 
         except Exception as e:
-            print(f"Error calculating strategy weights: {e}")
-            return {'SMC': 0.4, 'Trap': 0.3, 'Scalp': 0.3}
+            logger.error("Error calculating strategy weights: %s", e)
+            return self._strategy_weights[2]
     
     def generate_signal_for_strategy(self, strategy_name: str, symbol: str, 
-                                   data: pd.DataFrame, market_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Generate signal using a specific strategy"""
+                                   data: MarketBundle, current_price: float,
+                                   validate: bool = True) -> Optional[Dict[str, Any]]:
+        """Generate signal using a specific strategy (validate=False leaves validation to the caller)"""
         try:
             signal = None
             
@@ -191,33 +239,33 @@ class SignalEngine:
                 order_flow_data = self.dark_pool.get_dark_pool_analysis(symbol)
                 signal_obj = self.trap_strategy.generate_signal(symbol, data, liquidation_data, order_flow_data)
                 if signal_obj:
-                    signal = asdict(signal_obj)
+                    signal = signal_obj.to_dict()
                     
             elif strategy_name == 'SMC':
                 signal_obj = self.smc_strategy.generate_signal(symbol, data)
                 if signal_obj:
-                    signal = asdict(signal_obj)
+                    signal = signal_obj.to_dict()
                     
             elif strategy_name == 'Scalp':
                 signal_obj = self.scalp_strategy.generate_signal(symbol, data)
                 if signal_obj:
-                    signal = asdict(signal_obj)
+                    signal = signal_obj.to_dict()
             
             # Convert signal to standard format if generated
             if signal:
                 # Add market data
-                signal['current_price'] = market_data['price']
+                signal['current_price'] = current_price
                 signal['symbol'] = symbol
                 signal['strategy'] = strategy_name
                 
                 # Validate signal
-                if self.validate_signal(signal):
+                if not validate or self.validate_signal(signal):
                     return signal
             
             return None
             
         except Exception as e:
-            print(f"Error generating {strategy_name} signal for {symbol}: {e}")
+            logger.error("Error generating %s signal for %s: %s", strategy_name, symbol, e)
             return None
     
     def validate_signal(self, signal: Dict[str, Any]) -> bool:
@@ -253,21 +301,45 @@ class SignalEngine:
             return True
             
         except Exception as e:
-            print(f"Error validating signal: {e}")
+            logger.error("Error validating signal: %s", e)
             return False
     
+    def validate_signals_batch(self, signals: List[Dict[str, Any]]) -> np.ndarray:
+        """Validate many signals at once with the validate_signal rules; returns a boolean mask"""
+        try:
+            if not signals:
+                return np.zeros(0, dtype=bool)
+            
+            # Rows of (entry, tp1, tp2, tp3); LONG targets rise from entry, SHORT targets fall
+            levels = np.array([(s['entry'], *s['take_profit']) for s in signals], dtype=np.float64)
+            stop_loss = np.array([s['stop_loss'] for s in signals], dtype=np.float64)
+            confidence = np.array([s['confidence'] for s in signals], dtype=np.float64)
+            direction = np.array([1.0 if s['signal_type'] == 'LONG' else -1.0 for s in signals])
+            entry, tp1 = levels[:, 0], levels[:, 1]
+            
+            ordered = (np.diff(levels, axis=1) * direction[:, None] > 0).all(axis=1)
+            stop_ok = (entry - stop_loss) * direction > 0
+            
+            risk = np.abs(entry - stop_loss)
+            rr_ratio = np.divide(np.abs(tp1 - entry), risk, out=np.zeros_like(risk), where=risk != 0)
+            
+            return (confidence >= self.min_confidence) & ordered & stop_ok & (rr_ratio >= 1.5)
+            
+        except Exception as e:
+            logger.error("Error validating signals: %s", e)
+            return np.zeros(len(signals), dtype=bool)
+    
     def select_best_signal(self, signals: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """Select the best signal from multiple candidates"""
         try:
             if not signals:
                 return None
             
-            # Sort by confidence
-            sorted_signals = sorted(signals, key=lambda x: x['confidence'], reverse=True)
-            return sorted_signals[0]
+            # Highest confidence wins; ties keep the first candidate, as the stable sort did
+            return max(signals, key=lambda x: x['confidence'])
             
         except Exception as e:
-            print(f"Error selecting best signal: {e}")
+            logger.error("Error selecting best signal: %s", e)
             return None
     
     def generate_signal(self, market_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -276,19 +348,19 @@ class SignalEngine:
             symbol = market_data['symbol']
             current_price = market_data['price']
             
-            print(f"Testing signal generation for {symbol}...")
+            logger.debug("Testing signal generation for %s...", symbol)
             
             # Check cooldown
             last_signal_time = self.last_signal_time.get(symbol)
             if last_signal_time:
                 time_since_last = datetime.now() - last_signal_time
                 if time_since_last < timedelta(minutes=self.cooldown_minutes):
-                    print(f"⚠ Cooldown period for {symbol} not expired")
+                    logger.debug("Cooldown period for %s not expired", symbol)
                     return None
             
             # Check daily limit
             if self.daily_signals >= self.max_daily_signals:
-                print(f"⚠ Daily signal limit reached")
+                logger.warning("Daily signal limit reached")
                 return None
             
             # Prepare market data
@@ -296,11 +368,15 @@ class SignalEngine:
             if data.empty:
                 return None
             
-            # Get market regime
-            regime_data = self.regime.detect_market_regime(data)
-            
-            # Get strategy weights based on market regime
-            strategy_weights = self.get_strategy_weights(regime_data)
+            # Market regime and strategy weights, memoized on the same full last-bar row as the data
+            last_bar = tuple(data[column][-1] for column in ('timestamp', 'open', 'high', 'low', 'close', 'volume'))
+            cached = self._regime_cache.get(symbol)
+            if cached and cached[0] == last_bar:
+                regime_data, strategy_weights = cached[1], cached[2]
+            else:
+                regime_data = self.regime.detect_market_regime(data.to_df())
+                strategy_weights = self.get_strategy_weights(regime_data)
+                self._regime_cache[symbol] = (last_bar, regime_data, strategy_weights)
             
             # Generate signals from each strategy
             candidate_signals = []
@@ -308,13 +384,18 @@ class SignalEngine:
             for strategy_name, weight in strategy_weights.items():
                 # Only use strategies with significant weight
                 if weight > 0.1:
-                    signal = self.generate_signal_for_strategy(strategy_name, symbol, data, market_data)
+                    signal = self.generate_signal_for_strategy(strategy_name, symbol, data, current_price,
+                                                               validate=False)
                     if signal:
                         # Apply weight to confidence
                         weighted_confidence = int(signal['confidence'] * weight)
                         signal['weighted_confidence'] = weighted_confidence
                         candidate_signals.append(signal)
             
+            # Validate all candidates in one pass
+            valid = self.validate_signals_batch(candidate_signals)
+            candidate_signals = [signal for signal, ok in zip(candidate_signals, valid) if ok]
+            
             # Select best signal
             best_signal = self.select_best_signal(candidate_signals)
             
@@ -322,63 +403,75 @@ class SignalEngine:
                 # Add additional metadata
                 best_signal['market_regime'] = regime_data
                 best_signal['strategy_weights'] = strategy_weights
-                best_signal['timestamp'] = datetime.now().isoformat()
-                
-                # Update tracking
-                self.last_signal_time[symbol] = datetime.now()
-                self.daily_signals += 1
-                self.signal_history.append(best_signal)
                 
-                # Log signal
-                self.logger.log_signal(best_signal)
+                with self._state_lock:
+                    # Another worker may have used up the daily limit meanwhile
+                    if self.daily_signals >= self.max_daily_signals:
+                        logger.warning("Daily signal limit reached")
+                        return None
+                    
+                    # Stamped under the lock so history timestamps stay sorted
+                    now = datetime.now()
+                    best_signal['timestamp'] = now.isoformat()
+                    
+                    # Update tracking
+                    self.last_signal_time[symbol] = now
+                    self.daily_signals += 1
+                    self.signal_history.append(best_signal)
+                    self._signal_ts = np.append(self._signal_ts, np.datetime64(now, 's'))[-self.history_size:]
+                    
+                    # Log signal
+                    self.logger.log_signal(best_signal)
                 
-                print(f"✅ Signal generated for {symbol}: {best_signal['signal_type']} @ {best_signal['entry']:.2f}")
+                logger.info("Signal generated for %s: %s @ %.2f", symbol, best_signal['signal_type'], best_signal['entry'])
                 return best_signal
             
             return None
             
         except Exception as e:
-            print(f"❌ Error generating signal for {symbol}: {e}")
+            logger.error("Error generating signal for %s: %s", market_data.get('symbol'), e)
             return None
     
+    def process_symbol(self, market: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Fetch one market's OHLCV and run signal generation on it"""
+        return self.generate_signal(market)
+    
     def process_markets(self, markets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Process markets and generate signals"""
         signals = []
+        if not markets:
+            return signals
         
-        for market in markets:
+        # Each market fetches its own OHLCV and goes straight on to signal generation, so analysis
+        # starts as soon as that symbol's data lands and cooled-down symbols skip the fetch entirely
+        futures = {self._market_pool.submit(self.process_symbol, market): market for market in markets}
+        for future in as_completed(futures):
             try:
-                signal = self.generate_signal(market)
+                signal = future.result()
                 if signal:
                     signals.append(signal)
-                    
-                    # Send signal via Telegram
-                    print(f"[STUB] Would send signal: {signal}")
-                    
-                    # Rate limiting
-                    time.sleep(1)
-                    
             except Exception as e:
-                print(f"❌ Error processing {market['symbol']}: {e}")
-                continue
+                logger.error("Error processing %s: %s", futures[future]['symbol'], e)
         
         return signals
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get signal generation statistics"""
         try:
-            today = datetime.now().date()
-            today_signals = [s for s in self.signal_history if datetime.fromisoformat(s['timestamp']).date() == today]
+            # Timestamps are sorted, so today's signals are the tail after midnight
+            midnight = np.datetime64(datetime.combine(datetime.now().date(), datetime.min.time()), 's')
+            today_count = len(self._signal_ts) - int(np.searchsorted(self._signal_ts, midnight))
             
             return {
-                'total_signals_today': len(today_signals),
+                'total_signals_today': today_count,
                 'max_daily_signals': self.max_daily_signals,
-                'signals_remaining': max(0, self.max_daily_signals - len(today_signals)),
+                'signals_remaining': max(0, self.max_daily_signals - today_count),
                 'cooldown_minutes': self.cooldown_minutes,
                 'min_confidence': self.min_confidence,
-                'last_signals': self.signal_history[-5:] if self.signal_history else []
+                'last_signals': list(self.signal_history)[-5:]
             }
         except Exception as e:
-            print(f"❌ Error getting statistics: {e}")
+            logger.error("Error getting statistics: %s", e)
             return {}
     
     def get_signal_statistics(self) -> Dict[str, Any]:
@@ -388,22 +481,17 @@ class SignalEngine:
     def get_market_summary(self, markets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Get summary of scanned markets"""
         try:
-            summary = []
-            for market in markets:
-                summary.append({
-                    'symbol': market['symbol'],
-                    'price': market['price'],
-                    'volume_24h': market.get('volume_24h', 0),
-                    'technical_score': market.get('technical_score', 0),
-                    'liquidation_density': market.get('liquidation_density', 0),
-                    'funding_rate': market.get('funding_rate', 0)
-                })
-            return summary
+            # Column projection in one DataFrame pass; missing fields default to 0
+            columns = ['symbol', 'price', 'volume_24h', 'technical_score', 'liquidation_density', 'funding_rate']
+            summary = pd.DataFrame(markets).reindex(columns=columns, fill_value=0).fillna(0)
+            return summary.to_dict('records')
         except Exception as e:
-            print(f"❌ Error getting market summary: {e}")
+            logger.error("Error getting market summary: %s", e)
             return []
     
     def reset_daily_counters(self):
         """Reset daily signal counters"""
         self.daily_signals = 0
-        self.last_signal_time = {} 
\ No newline at end of file
+        self.last_signal_time = {}
+        self._data_cache = {}
+        self._regime_cache = {} 
\ No newline at end of file
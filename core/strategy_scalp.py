@@ -4,12 +4,14 @@ Implements high-frequency scalping with VWAP and momentum filters
 """
 
 import numpy as np
-import pandas as pd
 from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 import math
 
+from .market_bundle import MarketBundle
+from ._scalp_core import scalp_core, scalp_targets, chandelier_exit, indicators_from_mask
+
 @dataclass
 class ScalpSignal:
     symbol: str
@@ -21,6 +23,20 @@ class ScalpSignal:
     indicators: Dict[str, bool]
     market_data: Dict[str, Any]
     timestamp: datetime
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict of the fields; sub-dicts are shared, not deep-copied like asdict()"""
+        return {
+            'symbol': self.symbol,
+            'signal_type': self.signal_type,
+            'entry': self.entry,
+            'stop_loss': self.stop_loss,
+            'take_profit': self.take_profit,
+            'confidence': self.confidence,
+            'indicators': self.indicators,
+            'market_data': self.market_data,
+            'timestamp': self.timestamp
+        }
 
 class ScalpingStrategy:
     def __init__(self):
@@ -28,44 +44,52 @@ class ScalpingStrategy:
         self.required_indicators = [
             'ema_9', 'ema_21', 'rsi', 'vwap', 'atr', 'volume'
         ]
+        
+        # Centered x-axis and its sum of squares for the 20-bar VWAP regression
+        self._slope_x = np.arange(20, dtype=np.float64) - 9.5
+        self._slope_den = float((self._slope_x ** 2).sum())
     
-    def calculate_vwap_slope(self, data: pd.DataFrame, period: int = 20) -> float:
+    def calculate_vwap_slope(self, data: MarketBundle, period: int = 20) -> float:
         """Calculate VWAP slope in degrees"""
         try:
             if len(data) < period:
                 return 0
             
-            vwap_values = data['vwap'].iloc[-period:]
-            time_points = list(range(len(vwap_values)))
+            vwap_values = data.vwap[-period:]
             
-            # Calculate linear regression slope
-            slope = np.polyfit(time_points, vwap_values, 1)[0]
+            # Closed-form least-squares slope against bar index
+            if period == len(self._slope_x):
+                x, x_den = self._slope_x, self._slope_den
+            else:
+                x = np.arange(period, dtype=np.float64) - (period - 1) / 2
+                x_den = float((x ** 2).sum())
+            slope = float((x * (vwap_values - vwap_values.mean())).sum()) / x_den
             
             # Convert slope to degrees (assuming price units per bar)
             # This is a simplified conversion - in practice you might want to normalize
-            slope_degrees = math.degrees(math.atan(slope / data['close'].iloc[-1] * 100))
+            slope_degrees = math.degrees(math.atan(slope / data.close[-1] * 100))
             
             return slope_degrees
         except Exception as e:
             print(f"Error in calculate_vwap_slope: {e}")
             return 0
     
-    def detect_volume_spike(self, data: pd.DataFrame, 
+    def detect_volume_spike(self, data: MarketBundle, 
                           multiplier: float = 1.5) -> bool:
         """Detect volume spike compared to average"""
         try:
             if len(data) < 10:
                 return False
             
-            avg_volume = data['volume'].iloc[-10:-1].mean()
-            current_volume = data['volume'].iloc[-1]
+            volume = data.volume
+            avg_volume = volume[-10:-1].mean()
             
-            return current_volume > (avg_volume * multiplier)
+            return bool(volume[-1] > (avg_volume * multiplier))
         except Exception as e:
             print(f"Error in detect_volume_spike: {e}")
             return False
     
-    def calculate_chandelier_exit(self, data: pd.DataFrame, 
+    def calculate_chandelier_exit(self, data: MarketBundle, 
                                 atr_period: int = 14, 
                                 multiplier: float = 0.3) -> float:
         """Calculate Chandelier Exit for stop loss"""
@@ -73,119 +97,56 @@ class ScalpingStrategy:
             if len(data) < atr_period:
                 return 0
             
-            # Get highest high over ATR period
-            highest_high = data['high'].iloc[-atr_period:].max()
-            
-            # Get latest ATR
-            atr = data['atr'].iloc[-1] if len(data) > 0 else 0
-            
-            # Calculate Chandelier Exit
-            chandelier_exit = highest_high - (atr * multiplier)
-            
-            return chandelier_exit
+            # Highest high over the ATR period less a fraction of the latest ATR
+            return chandelier_exit(data.high, float(data.atr[-1]), atr_period, multiplier)
         except Exception as e:
             print(f"Error in calculate_chandelier_exit: {e}")
             return 0
     
-    def validate_scalping_setup(self, data: pd.DataFrame) -> Tuple[bool, Dict[str, bool]]:
-        """Validate scalping setup with multiple confirmation layers"""
+    def validate_scalping_setup(self, data: MarketBundle) -> Tuple[bool, Dict[str, bool], float, float, float]:
+        """Validate scalping setup; returns (is_valid, indicators, normalized vwap slope, entry, atr)"""
         try:
-            indicators = {
-                'vwap_slope': False,
-                'volume_spike': False,
-                'rsi_filter': False,
-                'ema_confirmation': False,
-                'momentum_filter': False
-            }
-            
-            # 1. VWAP slope > 30 degrees
-            vwap_slope = self.calculate_vwap_slope(data)
-            indicators['vwap_slope'] = vwap_slope > 30
-            
-            # 2. Volume spike > 1.5x average
-            indicators['volume_spike'] = self.detect_volume_spike(data, 1.5)
-            
-            # 3. RSI in optimal range (40-60)
-            if len(data) > 0:
-                rsi = data['rsi'].iloc[-1]
-                indicators['rsi_filter'] = 40 <= rsi <= 60
-            
-            # 4. EMA confirmation
-            if len(data) >= 21:
-                ema_9 = data['ema_9'].iloc[-1]
-                ema_21 = data['ema_21'].iloc[-1]
-                prev_ema_9 = data['ema_9'].iloc[-2]
-                prev_ema_21 = data['ema_21'].iloc[-2]
-                
-                # Golden cross or death cross confirmation
-                indicators['ema_confirmation'] = (
-                    (ema_9 > ema_21 and prev_ema_9 <= prev_ema_21) or  # Golden cross
-                    (ema_9 < ema_21 and prev_ema_9 >= prev_ema_21)     # Death cross
-                )
-            
-            # 5. Momentum filter (price change > 0.2% in last 3 bars)
-            if len(data) >= 3:
-                price_change = (data['close'].iloc[-1] - data['close'].iloc[-3]) / data['close'].iloc[-3] * 100
-                indicators['momentum_filter'] = abs(price_change) > 0.2
-            
-            # At least 4 out of 5 confirmations required for scalping
-            confirmations = sum(indicators.values())
-            return confirmations >= 4, indicators
+            # VWAP slope, volume spike, RSI range, EMA cross and momentum in one compiled pass
+            is_valid, mask, normalized_slope, entry = scalp_core(
+                data.close, data.volume, data.vwap, data.rsi, data.ema_9, data.ema_21)
+            atr = float(data.atr[-1]) if len(data) > 0 else 0
+            if math.isnan(atr):
+                atr = 0
+            return bool(is_valid), indicators_from_mask(mask), normalized_slope, entry, atr
             
         except Exception as e:
             print(f"Error in validate_scalping_setup: {e}")
-            return False, {}
+            return False, {}, 0, 0, 0
     
     def calculate_scalp_targets(self, entry: float, atr: float, 
                               signal_type: str) -> Tuple[float, float, float, float]:
         """Calculate SL and TP levels for scalping strategy"""
         try:
-            # SL: 0.3% Chandelier exit
-            sl_distance = entry * 0.003
-            
-            # TP levels: 0.5-1% trailing targets
-            tp1_distance = entry * 0.005  # 0.5%
-            tp2_distance = entry * 0.01   # 1.0%
-            tp3_distance = entry * 0.015  # 1.5%
-            
-            if signal_type == 'LONG':
-                stop_loss = entry - sl_distance
-                tp1 = entry + tp1_distance
-                tp2 = entry + tp2_distance
-                tp3 = entry + tp3_distance
-            else:  # SHORT
-                stop_loss = entry + sl_distance
-                tp1 = entry - tp1_distance
-                tp2 = entry - tp2_distance
-                tp3 = entry - tp3_distance
-            
-            return stop_loss, tp1, tp2, tp3
+            # SL: 0.3% Chandelier exit; TP levels: 0.5-1.5% trailing targets
+            return scalp_targets(float(entry), signal_type == 'LONG')
         except Exception as e:
             print(f"Error in calculate_scalp_targets: {e}")
             return 0, 0, 0, 0
     
-    def generate_signal(self, symbol: str, data: pd.DataFrame) -> Optional[ScalpSignal]:
+    def generate_signal(self, symbol: str, data: MarketBundle) -> Optional[ScalpSignal]:
         """Generate scalping trading signal"""
         try:
-            # Validate setup
-            is_valid, indicators = self.validate_scalping_setup(data)
+            # Validate setup; slope, entry and ATR come back from the same pass
+            is_valid, indicators, normalized_slope, entry, atr = self.validate_scalping_setup(data)
             
             if not is_valid:
                 return None
             
-            # Determine signal type based on VWAP slope and EMA
-            vwap_slope = self.calculate_vwap_slope(data)
-            signal_type = 'LONG' if vwap_slope > 0 else 'SHORT'
-            
-            # Entry at market price
-            entry = data['close'].iloc[-1]
-            
-            # Calculate ATR for target calculation
-            atr = data['atr'].iloc[-1] if len(data) > 0 else 0
+            # Determine signal type based on VWAP slope
+            signal_type = 'LONG' if normalized_slope > 0 else 'SHORT'
             
             # Calculate SL and TP levels
             sl, tp1, tp2, tp3 = self.calculate_scalp_targets(entry, atr, signal_type)
             
+            # Volume vs the previous 9-bar average, reported with the signal
+            tail = data.tail_stats()
+            volume_ratio = tail.current_volume / tail.avg_volume if len(data) >= 10 else 1
+            
             # Calculate confidence based on confirmations
             confirmations = sum(indicators.values())
             confidence = min(5, confirmations)  # Max confidence is 5
@@ -206,9 +167,8 @@ class ScalpingStrategy:
                 indicators=indicators,
                 market_data={
                     'atr': atr,
-                    'volume_ratio': data['volume'].iloc[-1] / data['volume'].iloc[-10:-1].mean() \
-                                  if len(data) >= 10 else 1,
-                    'vwap_slope': vwap_slope
+                    'volume_ratio': volume_ratio,
+                    'vwap_slope': math.degrees(math.atan(normalized_slope))  # degrees, for reporting only
                 },
                 timestamp=datetime.now()
             )
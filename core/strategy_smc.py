@@ -3,12 +3,77 @@ Smart Money Concepts (SMC) Strategy Module
 Implements order block, FVG, and breaker detection
 """
 
+import threading
 import numpy as np
-import pandas as pd
-from typing import Dict, Any, Optional, Tuple, List
+from concurrent.futures import ThreadPoolExecutor
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, Any, Optional, Tuple, List, Callable, Iterable
 from dataclasses import dataclass
 from datetime import datetime
 
+from .market_bundle import MarketBundle
+from .jit import njit, NUMBA_AVAILABLE
+
+# ATR multiples for (SL, TP1, TP2, TP3)
+SMC_TARGET_ATR = (2.0, 0.7, 1.4, 2.1)
+
+@njit(cache=True, nogil=True)
+def _scan_smc(o, h, l, c, v, lookback_period):
+    """Order block, FVG and breaker hits in one pass over the bars.
+
+    Returns (ob_idx, fvg_idx, fvg_bull, breaker_idx, breaker_bull), each in bar order.
+    """
+    n = c.shape[0]
+    ob_idx = np.empty(n, dtype=np.int64)
+    fvg_idx = np.empty(n, dtype=np.int64)
+    fvg_bull = np.empty(n, dtype=np.bool_)
+    br_idx = np.empty(n, dtype=np.int64)
+    br_bull = np.empty(n, dtype=np.bool_)
+    n_ob = 0
+    n_fvg = 0
+    n_br = 0
+    vol_sum = 0.0  # sum of the (up to) 10 volumes before bar i
+    for i in range(n):
+        if i >= lookback_period:
+            # Order block: impulsive candle followed by 2+ small candles among the next 4
+            rng = h[i] - l[i]
+            if rng > 0 and abs(c[i] - o[i]) > rng * 0.7:
+                small = 0
+                for j in range(i + 1, min(i + 5, n)):
+                    retracement_range = h[j] - l[j]
+                    if retracement_range > 0 and abs(c[j] - o[j]) < retracement_range * 0.3:
+                        small += 1
+                if small >= 2:
+                    ob_idx[n_ob] = i
+                    n_ob += 1
+            
+            # FVG: gap between candle i and candle i+2
+            if i + 2 < n:
+                if l[i + 2] > h[i]:
+                    fvg_idx[n_fvg] = i
+                    fvg_bull[n_fvg] = True
+                    n_fvg += 1
+                elif h[i + 2] < l[i]:
+                    fvg_idx[n_fvg] = i
+                    fvg_bull[n_fvg] = False
+                    n_fvg += 1
+            
+            # Breaker: close beyond the previous bar on 1.5x the prior 10-bar volume
+            if i >= 10 and i + 3 < n and v[i] > vol_sum / 10 * 1.5:
+                if c[i] > h[i - 1]:
+                    br_idx[n_br] = i
+                    br_bull[n_br] = True
+                    n_br += 1
+                elif c[i] < l[i - 1]:
+                    br_idx[n_br] = i
+                    br_bull[n_br] = False
+                    n_br += 1
+        
+        vol_sum += v[i]
+        if i >= 10:
+            vol_sum -= v[i - 10]
+    return ob_idx[:n_ob], fvg_idx[:n_fvg], fvg_bull[:n_fvg], br_idx[:n_br], br_bull[:n_br]
+
 @dataclass
 class SMCSignal:
     symbol: str
@@ -20,6 +85,20 @@ class SMCSignal:
     indicators: Dict[str, bool]
     market_data: Dict[str, Any]
     timestamp: datetime
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Signal fields as a plain dict"""
+        return {
+            'symbol': self.symbol,
+            'signal_type': self.signal_type,
+            'entry': self.entry,
+            'stop_loss': self.stop_loss,
+            'take_profit': self.take_profit,
+            'confidence': self.confidence,
+            'indicators': self.indicators,
+            'market_data': self.market_data,
+            'timestamp': self.timestamp
+        }
 
 class SMCStrategy:
     def __init__(self):
@@ -27,133 +106,168 @@ class SMCStrategy:
         self.required_indicators = [
             'ema_20', 'ema_50', 'rsi', 'macd', 'vwap', 'atr', 'volume'
         ]
+        
+        # Detector results per (detector, symbol, bundle, length, last bar); oldest evicted first.
+        # Entries hold their bundle so its id() can't be reused by another bundle while cached
+        self._cache = {}
+        self._cache_size = 32
+        self._cache_lock = threading.Lock()
     
-    def detect_order_blocks(self, data: pd.DataFrame, 
+    def _memo(self, name: str, data: MarketBundle, compute: Callable[[], Any]) -> Any:
+        """Return a detector result for this bundle, computing it only on the first call"""
+        key = (name, data.symbol, id(data), len(data), data.timestamp[-1] if len(data) else None)
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] is data:
+                return entry[1]
+        result = compute()
+        with self._cache_lock:
+            self._cache[key] = (data, result)
+            while len(self._cache) > self._cache_size:
+                del self._cache[next(iter(self._cache))]
+        return result
+    
+    def _order_blocks(self, data: MarketBundle, 
+                    lookback_period: int = 50) -> List[Dict[str, Any]]:
+        """Order block hits without error handling"""
+        if len(data) < lookback_period:
+            return []
+        
+        o, h, l, c = data.open, data.high, data.low, data.close
+        
+        if NUMBA_AVAILABLE:
+            # The fused kernel's order block pass; its FVG and breaker output is dropped
+            hits = _scan_smc(o, h, l, c, data.volume, lookback_period)[0]
+        else:
+            n = len(c)
+            body = np.abs(c - o)
+            rng = h - l
+        
+            # Impulsive candle: large body relative to range
+            impulsive = (body > rng * 0.7) & (rng > 0)
+            # Small retracement candle: small body relative to range
+            small = (body < rng * 0.3) & (rng > 0)
+        
+            # Small candles among the (up to) 4 that follow each bar; the tail window is zero-padded
+            following = np.concatenate([small[1:], np.zeros(4, dtype=bool)])
+            retracement_candles = sliding_window_view(following, 4)[:n].sum(axis=1)
+        
+            # If we have at least 2 small retracement candles
+            hits = np.flatnonzero(impulsive[lookback_period:] & (retracement_candles[lookback_period:] >= 2)) + lookback_period
+        order_blocks = [{
+            'type': 'bullish' if c[i] > o[i] else 'bearish',
+            'high': h[i],
+            'low': l[i],
+            'timestamp': int(i)
+        } for i in hits]
+        
+        return order_blocks
+    
+    def detect_order_blocks(self, data: MarketBundle, 
                           lookback_period: int = 50) -> List[Dict[str, Any]]:
         """Detect order blocks (OB) in the market data"""
         try:
-            order_blocks = []
-            
-            if len(data) < lookback_period:
-                return order_blocks
-            
-            # Look for impulsive moves with low volume retracements
-            for i in range(lookback_period, len(data)):
-                # Check for impulsive candle
-                candle_body = abs(data['close'].iloc[i] - data['open'].iloc[i])
-                candle_range = data['high'].iloc[i] - data['low'].iloc[i]
-                
-                # Impulsive candle: large body relative to range
-                if candle_body > candle_range * 0.7 and candle_range > 0:
-                    # Check if followed by small retracement candles
-                    retracement_candles = 0
-                    for j in range(i+1, min(i+5, len(data))):
-                        retracement_body = abs(data['close'].iloc[j] - data['open'].iloc[j])
-                        retracement_range = data['high'].iloc[j] - data['low'].iloc[j]
-                        
-                        if retracement_range > 0 and retracement_body < retracement_range * 0.3:
-                            retracement_candles += 1
-                    
-                    # If we have at least 2 small retracement candles
-                    if retracement_candles >= 2:
-                        ob_type = 'bullish' if data['close'].iloc[i] > data['open'].iloc[i] else 'bearish'
-                        order_blocks.append({
-                            'type': ob_type,
-                            'high': data['high'].iloc[i],
-                            'low': data['low'].iloc[i],
-                            'timestamp': i
-                        })
-            
-            return order_blocks
+            return self._order_blocks(data, lookback_period)
         except Exception as e:
             print(f"Error in detect_order_blocks: {e}")
             return []
     
-    def detect_fvg(self, data: pd.DataFrame, 
+    def _fvgs(self, data: MarketBundle, 
+              lookback_period: int = 50) -> List[Dict[str, Any]]:
+        """FVG hits without error handling"""
+        if len(data) < lookback_period + 2:
+            return []
+        
+        h, l = data.high, data.low
+        n = len(h)
+        
+        # Bullish FVG: low of candle i+2 > high of candle i
+        bull = l[lookback_period + 2:] > h[lookback_period:n - 2]
+        # Bearish FVG: high of candle i+2 < low of candle i (the two cannot both hold)
+        bear = h[lookback_period + 2:] < l[lookback_period:n - 2]
+        
+        # Gaps in bar order, as the bar-by-bar scan produced them
+        fvgs = []
+        for k in np.flatnonzero(bull | bear):
+            i = k + lookback_period
+            if bull[k]:
+                fvgs.append({'type': 'bullish', 'gap_top': l[i + 2], 'gap_bottom': h[i],
+                             'mitigated': False, 'timestamp': int(i)})
+            else:
+                fvgs.append({'type': 'bearish', 'gap_top': l[i], 'gap_bottom': h[i + 2],
+                             'mitigated': False, 'timestamp': int(i)})
+        
+        return fvgs
+    
+    def detect_fvg(self, data: MarketBundle, 
                    lookback_period: int = 50) -> List[Dict[str, Any]]:
         """Detect Fair Value Gaps (FVG)"""
         try:
-            fvgs = []
-            
-            if len(data) < lookback_period + 2:
-                return fvgs
-            
-            # Look for FVG patterns
-            for i in range(lookback_period, len(data) - 2):
-                # Bullish FVG: Low of candle i+2 > High of candle i
-                if data['low'].iloc[i+2] > data['high'].iloc[i]:
-                    fvgs.append({
-                        'type': 'bullish',
-                        'gap_top': data['low'].iloc[i+2],
-                        'gap_bottom': data['high'].iloc[i],
-                        'mitigated': False,
-                        'timestamp': i
-                    })
-                
-                # Bearish FVG: High of candle i+2 < Low of candle i
-                elif data['high'].iloc[i+2] < data['low'].iloc[i]:
-                    fvgs.append({
-                        'type': 'bearish',
-                        'gap_top': data['low'].iloc[i],
-                        'gap_bottom': data['high'].iloc[i+2],
-                        'mitigated': False,
-                        'timestamp': i
-                    })
-            
-            return fvgs
+            return self._fvgs(data, lookback_period)
         except Exception as e:
             print(f"Error in detect_fvg: {e}")
             return []
     
-    def detect_breaker_blocks(self, data: pd.DataFrame, 
+    def _breakers(self, data: MarketBundle, 
+                lookback_period: int = 50) -> List[Dict[str, Any]]:
+        """Breaker hits without error handling"""
+        if len(data) < lookback_period + 3:
+            return []
+        
+        h, l, c, v = data.high, data.low, data.close, data.volume
+        n = len(c)
+        start = max(lookback_period, 10)
+        if start >= n - 3:
+            return []
+        
+        # Mean of the 10 bars before bar i is roll[i - 10]
+        roll = np.convolve(v, np.ones(10, dtype=np.float64) / 10.0, mode='valid')
+        idx = np.arange(start, n - 3)
+        
+        # Volume confirmation, then a close beyond the previous bar's high (bullish) or low (bearish)
+        volume_ok = v[idx] > roll[idx - 10] * 1.5
+        bull = volume_ok & (c[idx] > h[idx - 1])
+        bear = volume_ok & (c[idx] < l[idx - 1])
+        
+        breakers = []
+        for i, is_bull in zip(idx[bull | bear], bull[bull | bear]):
+            if is_bull:
+                breakers.append({'type': 'bullish', 'level': h[i - 1], 'timestamp': int(i)})
+            else:
+                breakers.append({'type': 'bearish', 'level': l[i - 1], 'timestamp': int(i)})
+        
+        return breakers
+    
+    def detect_breaker_blocks(self, data: MarketBundle, 
                             lookback_period: int = 50) -> List[Dict[str, Any]]:
         """Detect breaker blocks that confirm order blocks"""
         try:
-            breakers = []
-            
-            if len(data) < lookback_period + 3:
-                return breakers
-            
-            # Look for breaker patterns
-            for i in range(lookback_period, len(data) - 3):
-                # Bullish breaker: Close above previous high with strong volume
-                prev_high = data['high'].iloc[i-1]
-                current_close = data['close'].iloc[i]
-                
-                if current_close > prev_high:
-                    # Check volume confirmation
-                    avg_volume = data['volume'].iloc[i-10:i].mean()
-                    current_volume = data['volume'].iloc[i]
-                    
-                    if current_volume > avg_volume * 1.5:
-                        breakers.append({
-                            'type': 'bullish',
-                            'level': prev_high,
-                            'timestamp': i
-                        })
-                
-                # Bearish breaker: Close below previous low with strong volume
-                prev_low = data['low'].iloc[i-1]
-                current_close = data['close'].iloc[i]
-                
-                if current_close < prev_low:
-                    # Check volume confirmation
-                    avg_volume = data['volume'].iloc[i-10:i].mean()
-                    current_volume = data['volume'].iloc[i]
-                    
-                    if current_volume > avg_volume * 1.5:
-                        breakers.append({
-                            'type': 'bearish',
-                            'level': prev_low,
-                            'timestamp': i
-                        })
-            
-            return breakers
+            return self._breakers(data, lookback_period)
         except Exception as e:
             print(f"Error in detect_breaker_blocks: {e}")
             return []
     
-    def find_optimal_ob_retest(self, data: pd.DataFrame, 
+    def _scan_all(self, data: MarketBundle, lookback_period: int = 50) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Order blocks, FVGs and breakers together, from one compiled pass when numba is available"""
+        if not NUMBA_AVAILABLE:
+            return (self._order_blocks(data, lookback_period),
+                    self._fvgs(data, lookback_period),
+                    self._breakers(data, lookback_period))
+        
+        o, h, l, c = data.open, data.high, data.low, data.close
+        ob_idx, fvg_idx, fvg_bull, br_idx, br_bull = _scan_smc(o, h, l, c, data.volume, lookback_period)
+        
+        order_blocks = [{'type': 'bullish' if c[i] > o[i] else 'bearish', 'high': h[i], 'low': l[i],
+                         'timestamp': int(i)} for i in ob_idx]
+        fvgs = [{'type': 'bullish', 'gap_top': l[i + 2], 'gap_bottom': h[i], 'mitigated': False, 'timestamp': int(i)}
+                if bull else
+                {'type': 'bearish', 'gap_top': l[i], 'gap_bottom': h[i + 2], 'mitigated': False, 'timestamp': int(i)}
+                for i, bull in zip(fvg_idx, fvg_bull)]
+        breakers = [{'type': 'bullish' if bull else 'bearish', 'level': h[i - 1] if bull else l[i - 1],
+                     'timestamp': int(i)} for i, bull in zip(br_idx, br_bull)]
+        return order_blocks, fvgs, breakers
+    
+    def find_optimal_ob_retest(self, data: MarketBundle, 
                              order_blocks: List[Dict[str, Any]]) -> Optional[float]:
         """Find optimal order block retest level for entry"""
         try:
@@ -178,33 +292,17 @@ class SMCStrategy:
     def calculate_smc_targets(self, entry: float, atr: float, 
                             signal_type: str) -> Tuple[float, float, float, float]:
         """Calculate SL and TP levels for SMC strategy"""
-        try:
-            # SL: Beyond liquidity pool (2x ATR)
-            sl_distance = atr * 2.0
-            
-            # TP levels: 2x imbalance
-            tp1_distance = atr * 0.7
-            tp2_distance = atr * 1.4
-            tp3_distance = atr * 2.1
-            
-            if signal_type == 'LONG':
-                stop_loss = entry - sl_distance
-                tp1 = entry + tp1_distance
-                tp2 = entry + tp2_distance
-                tp3 = entry + tp3_distance
-            else:  # SHORT
-                stop_loss = entry + sl_distance
-                tp1 = entry - tp1_distance
-                tp2 = entry - tp2_distance
-                tp3 = entry - tp3_distance
-            
-            return stop_loss, tp1, tp2, tp3
-        except Exception as e:
-            print(f"Error in calculate_smc_targets: {e}")
-            return 0, 0, 0, 0
+        # SL beyond liquidity pool (2x ATR); TP levels at 2x imbalance
+        sign = 1.0 if signal_type == 'LONG' else -1.0
+        sl_mult, tp1_mult, tp2_mult, tp3_mult = SMC_TARGET_ATR
+        return (entry - sign * atr * sl_mult,
+                entry + sign * atr * tp1_mult,
+                entry + sign * atr * tp2_mult,
+                entry + sign * atr * tp3_mult)
     
-    def validate_smc_setup(self, data: pd.DataFrame) -> Tuple[bool, Dict[str, bool]]:
-        """Validate SMC setup with multiple confirmation layers"""
+    def validate_smc_setup(self, data: MarketBundle, avg_volume: Optional[float] = None,
+                           current_volume: Optional[float] = None) -> Tuple[bool, Dict[str, bool]]:
+        """Validate SMC setup with multiple confirmation layers (volume stats may be passed in precomputed)"""
         try:
             indicators = {
                 'order_block': False,
@@ -214,27 +312,25 @@ class SMCStrategy:
                 'volume_confirmation': False
             }
             
+            # All three detectors share one scan, memoized for generate_signal
+            order_blocks, fvgs, breakers = self._memo('scan', data, lambda: self._scan_all(data))
+            
             # 1. Order block validation
-            order_blocks = self.detect_order_blocks(data)
             indicators['order_block'] = len(order_blocks) > 0
             
             if not indicators['order_block']:
                 return False, indicators
             
             # 2. FVG validation
-            fvgs = self.detect_fvg(data)
             indicators['fvg'] = len(fvgs) > 0
             
             # 3. Breaker validation
-            breakers = self.detect_breaker_blocks(data)
             indicators['breaker'] = len(breakers) > 0
             
             # 4. EMA confirmation
             if len(data) >= 50:
-                ema_20 = data['ema_20'].iloc[-1]
-                ema_50 = data['ema_50'].iloc[-1]
-                prev_ema_20 = data['ema_20'].iloc[-2]
-                prev_ema_50 = data['ema_50'].iloc[-2]
+                ema_20, prev_ema_20 = data.ema_20[-1], data.ema_20[-2]
+                ema_50, prev_ema_50 = data.ema_50[-1], data.ema_50[-2]
                 
                 # Golden cross or death cross confirmation
                 indicators['ema_confirmation'] = (
@@ -244,8 +340,10 @@ class SMCStrategy:
             
             # 5. Volume confirmation
             if len(data) >= 10:
-                avg_volume = data['volume'].iloc[-10:-1].mean()
-                current_volume = data['volume'].iloc[-1]
+                if avg_volume is None:
+                    avg_volume = data.volume[-10:-1].mean()
+                if current_volume is None:
+                    current_volume = data.volume[-1]
                 indicators['volume_confirmation'] = current_volume > (avg_volume * 1.5)
             
             # At least 3 out of 5 confirmations required
@@ -256,17 +354,22 @@ class SMCStrategy:
             print(f"Error in validate_smc_setup: {e}")
             return False, {}
     
-    def generate_signal(self, symbol: str, data: pd.DataFrame) -> Optional[SMCSignal]:
-        """Generate SMC trading signal"""
+    def generate_signal(self, symbol: str, data: MarketBundle,
+                        now: Optional[datetime] = None) -> Optional[SMCSignal]:
+        """Generate SMC trading signal (now: shared batch timestamp)"""
         try:
+            # Volume tail stats, shared by validation and the reported volume ratio
+            tail = data.tail_stats()
+            avg_volume, current_volume = tail.avg_volume, tail.current_volume
+            
             # Validate setup
-            is_valid, indicators = self.validate_smc_setup(data)
+            is_valid, indicators = self.validate_smc_setup(data, avg_volume, current_volume)
             
             if not is_valid:
                 return None
             
-            # Determine signal type based on setup
-            order_blocks = self.detect_order_blocks(data)
+            # Determine signal type based on setup; order blocks come from validation's scan
+            order_blocks = self._memo('scan', data, lambda: self._scan_all(data))[0]
             if not order_blocks:
                 return None
             
@@ -280,7 +383,7 @@ class SMCStrategy:
                 return None
             
             # Calculate ATR for target calculation
-            atr = data['atr'].iloc[-1] if len(data) > 0 else 0
+            atr = tail.atr
             
             # Calculate SL and TP levels
             sl, tp1, tp2, tp3 = self.calculate_smc_targets(entry, atr, signal_type)
@@ -294,22 +397,24 @@ class SMCStrategy:
             if rr_ratio < 1.5:
                 return None  # Skip signals with poor risk-reward
             
+            # Quantize all five levels in one call
+            entry_r, sl_r, tp1_r, tp2_r, tp3_r = np.round([entry, sl, tp1, tp2, tp3], 6).tolist()
+            
             # Create signal
             signal = SMCSignal(
                 symbol=symbol,
                 signal_type=signal_type,
-                entry=round(entry, 6),
-                stop_loss=round(sl, 6),
-                take_profit=(round(tp1, 6), round(tp2, 6), round(tp3, 6)),
+                entry=entry_r,
+                stop_loss=sl_r,
+                take_profit=(tp1_r, tp2_r, tp3_r),
                 confidence=confidence,
                 indicators=indicators,
                 market_data={
                     'atr': atr,
-                    'volume_ratio': data['volume'].iloc[-1] / data['volume'].iloc[-10:-1].mean() \
-                                  if len(data) >= 10 else 1,
+                    'volume_ratio': current_volume / avg_volume if len(data) >= 10 else 1,
                     'order_blocks_count': len(order_blocks)
                 },
-                timestamp=datetime.now()
+                timestamp=now or datetime.now()
             )
             
             return signal
@@ -317,3 +422,15 @@ class SMCStrategy:
         except Exception as e:
             print(f"Error in generate_smc_signal: {e}")
             return None
+    
+    def generate_signals(self, items: Iterable[Tuple[str, MarketBundle]],
+                         cores: Optional[int] = None) -> Dict[str, Optional[SMCSignal]]:
+        """Generate SMC signals for many symbols concurrently; returns symbol -> signal (or None)"""
+        items = list(items)
+        if not items:
+            return {}
+        now = datetime.now()
+        # The compiled scans release the GIL, so threads scale without pickling bundles to processes
+        with ThreadPoolExecutor(max_workers=cores or min(8, len(items))) as executor:
+            signals = executor.map(lambda item: self.generate_signal(*item, now=now), items)
+            return {symbol: signal for (symbol, _), signal in zip(items, signals)}
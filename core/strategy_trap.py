@@ -4,11 +4,26 @@ Implements liquidity grab detection and trap trading logic
 """
 
 import numpy as np
-import pandas as pd
 from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
+from .market_bundle import MarketBundle
+from .liquidation import LiquidationClusters
+
+# ATR multiples for (SL, TP1, TP2, TP3)
+TRAP_TARGET_ATR = (1.5, 0.5, 1.0, 1.5)
+
+# Centered bar index and its sum of squares for the 14-bar divergence slopes
+_X14 = np.arange(14, dtype=np.float64) - 6.5
+_X14_DENOM = float((_X14 * _X14).sum())
+
+
+def _slope14(y: np.ndarray) -> float:
+    """Least-squares slope of a 14-bar series against bar index"""
+    return float((_X14 * (y - y.mean())).sum() / _X14_DENOM)
+
+
 @dataclass
 class TrapSignal:
     symbol: str
@@ -20,6 +35,20 @@ class TrapSignal:
     indicators: Dict[str, bool]
     market_data: Dict[str, Any]
     timestamp: datetime
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Signal fields as a plain dict"""
+        return {
+            'symbol': self.symbol,
+            'signal_type': self.signal_type,
+            'entry': self.entry,
+            'stop_loss': self.stop_loss,
+            'take_profit': self.take_profit,
+            'confidence': self.confidence,
+            'indicators': self.indicators,
+            'market_data': self.market_data,
+            'timestamp': self.timestamp
+        }
 
 class TrapTradingStrategy:
     def __init__(self):
@@ -36,17 +65,10 @@ class TrapTradingStrategy:
             if not liquidation_map or 'clusters' not in liquidation_map:
                 return False
             
-            clusters = liquidation_map.get('clusters', [])
-            if not clusters:
-                return False
+            clusters = LiquidationClusters.coerce(liquidation_map['clusters'])
             
-            # Look for significant liquidation clusters
-            significant_clusters = [
-                cluster for cluster in clusters 
-                if cluster.get('size', 0) > 100000  # $100k+ liquidations
-            ]
-            
-            if not significant_clusters:
+            # Look for significant liquidation clusters ($100k+ liquidations)
+            if not (clusters.size > 100000).any():
                 return False
             
             # Check order flow confirmation
@@ -62,33 +84,22 @@ class TrapTradingStrategy:
             print(f"Error in detect_liquidity_grab: {e}")
             return False
     
-    def find_trap_confirmation_price(self, data: pd.DataFrame, 
-                                   liquidation_clusters: list) -> Optional[float]:
+    def find_trap_confirmation_price(self, data: MarketBundle, 
+                                   liquidation_clusters: LiquidationClusters) -> Optional[float]:
         """Find optimal trap confirmation price based on liquidation clusters"""
         try:
-            if not liquidation_clusters:
+            prices = LiquidationClusters.coerce(liquidation_clusters).price
+            if not len(prices):
                 return None
             
             # Get current price
-            current_price = data['close'].iloc[-1]
-            
-            # Find nearest significant liquidation cluster
-            nearest_cluster = None
-            min_distance = float('inf')
+            current_price = data.close[-1]
             
-            for cluster in liquidation_clusters:
-                cluster_price = cluster.get('price', 0)
-                distance = abs(current_price - cluster_price)
-                if distance < min_distance:
-                    min_distance = distance
-                    nearest_cluster = cluster
-            
-            if not nearest_cluster:
-                return None
+            # Find nearest significant liquidation cluster (first one on ties)
+            cluster_price = prices[np.abs(prices - current_price).argmin()]
             
             # Set trap confirmation price with buffer
             buffer = current_price * 0.001  # 0.1% buffer
-            cluster_price = nearest_cluster.get('price', 0)
             
             if current_price > cluster_price:
                 # Price above cluster - look for short trap
@@ -104,35 +115,20 @@ class TrapTradingStrategy:
     def calculate_trap_targets(self, entry: float, atr: float, 
                              signal_type: str) -> Tuple[float, float, float, float]:
         """Calculate SL and TP levels for trap trading"""
-        try:
-            # SL: Next liquidation cluster or 1.5x ATR
-            sl_distance = atr * 1.5
-            
-            # TP levels: 1:3 risk-reward ratio
-            tp1_distance = atr * 0.5
-            tp2_distance = atr * 1.0
-            tp3_distance = atr * 1.5
-            
-            if signal_type == 'LONG':
-                stop_loss = entry - sl_distance
-                tp1 = entry + tp1_distance
-                tp2 = entry + tp2_distance
-                tp3 = entry + tp3_distance
-            else:  # SHORT
-                stop_loss = entry + sl_distance
-                tp1 = entry - tp1_distance
-                tp2 = entry - tp2_distance
-                tp3 = entry - tp3_distance
-            
-            return stop_loss, tp1, tp2, tp3
-        except Exception as e:
-            print(f"Error in calculate_trap_targets: {e}")
-            return 0, 0, 0, 0
+        # SL at next liquidation cluster or 1.5x ATR; TP levels for a 1:3 risk-reward ratio
+        sign = 1.0 if signal_type == 'LONG' else -1.0
+        sl_mult, tp1_mult, tp2_mult, tp3_mult = TRAP_TARGET_ATR
+        return (entry - sign * atr * sl_mult,
+                entry + sign * atr * tp1_mult,
+                entry + sign * atr * tp2_mult,
+                entry + sign * atr * tp3_mult)
     
-    def validate_trap_setup(self, data: pd.DataFrame, 
+    def validate_trap_setup(self, data: MarketBundle, 
                           liquidation_data: Dict[str, Any],
-                          order_flow: Dict[str, Any]) -> Tuple[bool, Dict[str, bool]]:
-        """Validate trap trading setup with multiple confirmation layers"""
+                          order_flow: Dict[str, Any],
+                          avg_volume: Optional[float] = None,
+                          current_volume: Optional[float] = None) -> Tuple[bool, Dict[str, bool]]:
+        """Validate trap trading setup with multiple confirmation layers (volume stats may be passed in precomputed)"""
         try:
             indicators = {
                 'liquidity_grab': False,
@@ -151,10 +147,8 @@ class TrapTradingStrategy:
             
             # 2. EMA confirmation
             if len(data) >= 21:
-                ema_9 = data['ema_9'].iloc[-1]
-                ema_21 = data['ema_21'].iloc[-1]
-                prev_ema_9 = data['ema_9'].iloc[-2]
-                prev_ema_21 = data['ema_21'].iloc[-2]
+                ema_9, prev_ema_9 = data.ema_9[-1], data.ema_9[-2]
+                ema_21, prev_ema_21 = data.ema_21[-1], data.ema_21[-2]
                 
                 # Golden cross or death cross confirmation
                 indicators['ema_confirmation'] = (
@@ -164,18 +158,20 @@ class TrapTradingStrategy:
             
             # 3. Volume confirmation
             if len(data) >= 10:
-                avg_volume = data['volume'].iloc[-10:-1].mean()
-                current_volume = data['volume'].iloc[-1]
+                if avg_volume is None:
+                    avg_volume = data.volume[-10:-1].mean()
+                if current_volume is None:
+                    current_volume = data.volume[-1]
                 indicators['volume_confirmation'] = current_volume > (avg_volume * 1.5)
             
             # 4. RSI divergence
-            if len(data) >= 14:
-                rsi_values = data['rsi'].iloc[-14:]
-                price_values = data['close'].iloc[-14:]
+            if len(data) >= 14 and not np.isnan(data.rsi[-14]):
+                rsi_values = data.rsi[-14:]
+                price_values = data.close[-14:]
                 
                 # Check for bullish or bearish divergence
-                price_slope = np.polyfit(range(len(price_values)), price_values, 1)[0]
-                rsi_slope = np.polyfit(range(len(rsi_values)), rsi_values, 1)[0]
+                price_slope = _slope14(price_values)
+                rsi_slope = _slope14(rsi_values)
                 
                 # Bullish divergence: price making lower lows, RSI making higher lows
                 # Bearish divergence: price making higher highs, RSI making lower highs
@@ -186,10 +182,8 @@ class TrapTradingStrategy:
             
             # 5. MACD confirmation
             if len(data) >= 26:
-                macd_line = data['macd'].iloc[-1]
-                signal_line = data['macd_signal'].iloc[-1]
-                prev_macd = data['macd'].iloc[-2]
-                prev_signal = data['macd_signal'].iloc[-2]
+                macd_line, prev_macd = data.macd[-1], data.macd[-2]
+                signal_line, prev_signal = data.macd_signal[-1], data.macd_signal[-2]
                 
                 # MACD crossover
                 indicators['macd_confirmation'] = (
@@ -205,31 +199,36 @@ class TrapTradingStrategy:
             print(f"Error in validate_trap_setup: {e}")
             return False, {}
     
-    def generate_signal(self, symbol: str, data: pd.DataFrame, 
+    def generate_signal(self, symbol: str, data: MarketBundle, 
                        liquidation_data: Dict[str, Any],
-                       order_flow: Dict[str, Any]) -> Optional[TrapSignal]:
-        """Generate trap trading signal"""
+                       order_flow: Dict[str, Any],
+                       now: Optional[datetime] = None) -> Optional[TrapSignal]:
+        """Generate trap trading signal (now: shared batch timestamp)"""
         try:
+            # Volume tail stats, shared by validation and the reported volume ratio
+            tail = data.tail_stats()
+            avg_volume, current_volume = tail.avg_volume, tail.current_volume
+            
             # Validate setup
             is_valid, indicators = self.validate_trap_setup(
-                data, liquidation_data, order_flow)
+                data, liquidation_data, order_flow, avg_volume, current_volume)
             
             if not is_valid:
                 return None
             
             # Determine signal type based on setup
             signal_type = 'LONG' if indicators.get('ema_confirmation') and \
-                         data['ema_9'].iloc[-1] > data['ema_21'].iloc[-1] else 'SHORT'
+                         data.ema_9[-1] > data.ema_21[-1] else 'SHORT'
             
             # Find trap confirmation price
-            clusters = liquidation_data.get('clusters', [])
+            clusters = liquidation_data.get('clusters')
             entry = self.find_trap_confirmation_price(data, clusters)
             
             if not entry:
                 return None
             
             # Calculate ATR for target calculation
-            atr = data['atr'].iloc[-1] if len(data) > 0 else 0
+            atr = tail.atr
             
             # Calculate SL and TP levels
             sl, tp1, tp2, tp3 = self.calculate_trap_targets(entry, atr, signal_type)
@@ -243,21 +242,23 @@ class TrapTradingStrategy:
             if rr_ratio < 1.5:
                 return None  # Skip signals with poor risk-reward
             
+            # Quantize all five levels in one call
+            entry_r, sl_r, tp1_r, tp2_r, tp3_r = np.round([entry, sl, tp1, tp2, tp3], 6).tolist()
+            
             # Create signal
             signal = TrapSignal(
                 symbol=symbol,
                 signal_type=signal_type,
-                entry=round(entry, 6),
-                stop_loss=round(sl, 6),
-                take_profit=(round(tp1, 6), round(tp2, 6), round(tp3, 6)),
+                entry=entry_r,
+                stop_loss=sl_r,
+                take_profit=(tp1_r, tp2_r, tp3_r),
                 confidence=confidence,
                 indicators=indicators,
                 market_data={
                     'atr': atr,
-                    'volume_ratio': data['volume'].iloc[-1] / data['volume'].iloc[-10:-1].mean() \
-                                  if len(data) >= 10 else 1
+                    'volume_ratio': current_volume / avg_volume if len(data) >= 10 else 1
                 },
-                timestamp=datetime.now()
+                timestamp=now or datetime.now()
             )
             
             return signal
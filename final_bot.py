@@ -5,10 +5,20 @@ Integrates modular signal engine with working Telegram delivery
 """
 
 import os
+import atexit
+import logging
+import logging.handlers
+import queue
+import random
 import threading
+import functools
+import gzip
+from collections import defaultdict, deque
 import asyncio
-import requests
-from flask import Flask, jsonify, render_template
+import aiohttp
+import orjson
+from flask import Flask, Response, jsonify, render_template, request
+from flask.json.provider import DefaultJSONProvider
 from dotenv import load_dotenv
 from datetime import datetime
 import time
@@ -17,10 +27,29 @@ import time
 from core.signal_engine import SignalEngine
 from core.logger import SignalLogger
 from core.notifier import SignalNotifier
+from core.rate_limiter import TokenBucket
 
 # Load environment variables and config
 load_dotenv()
 
+def configure_logging():
+    """Route log records through a queue so formatting and stdout writes happen off the hot path"""
+    root = logging.getLogger()
+    if any(isinstance(h, logging.handlers.QueueHandler) for h in root.handlers):
+        return
+    
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+    listener.start()
+    atexit.register(listener.stop)
+
+configure_logging()
+
 # Import configuration
 try:
     import bot_config
@@ -41,7 +70,50 @@ except ImportError:
     BINANCE_API_KEY = BINANCE_SECRET_KEY = GMAIL_APP_PASSWORD = None
     ACCOUNT_BALANCE = RISK_PERCENTAGE = MAX_DAILY_SIGNALS = COOLDOWN_MINUTES = None
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson; datetimes still go through Flask's HTTP-date default"""
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.options).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+class StatusDict(dict):
+    """Status fields plus their JSON encoding, re-encoded only after a field is assigned"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._version = 0
+        self._encoded = (-1, b'')
+        self._changed = threading.Condition()
+
+    def __setitem__(self, key, value):
+        with self._changed:
+            super().__setitem__(key, value)
+            self._version += 1
+            self._changed.notify_all()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def wait_for_change(self, version: int, timeout: float) -> bool:
+        """Block until the status moves past `version`; False if `timeout` passes first"""
+        with self._changed:
+            return self._changed.wait_for(lambda: self._version != version, timeout)
+
+    def to_json(self) -> bytes:
+        # Tagged with the version read before encoding, so a concurrent write just forces a re-encode next time
+        version, encoded = self._encoded
+        if version != self._version:
+            version = self._version
+            encoded = orjson.dumps(dict(self))
+            self._encoded = (version, encoded)
+        return encoded
 
 class EnhancedScalpBot:
     def __init__(self):
@@ -52,6 +124,9 @@ class EnhancedScalpBot:
         self.profit_chat_id = "7138380222"
         print(f"✅ Using hardcoded credentials: Token={self.telegram_token[:20]}...")
         
+        # Read once; sends in test mode are logged instead of posted
+        self._test_mode = os.getenv('TEST_MODE', '').lower() == 'true'
+        
         # Core components
         self.signal_engine = SignalEngine()
         self.logger = SignalLogger()
@@ -59,7 +134,21 @@ class EnhancedScalpBot:
         
         # Bot status
         self.running = False
-        self.status = {
+        self._stop_event = threading.Event()
+        # Held for the duration of a scan so the loop and /api/scan-now never scan concurrently
+        self._scan_lock = threading.Lock()
+        
+        # Scan cadence: at most every 60s, at least every 5 minutes, and in between as soon as
+        # 3 symbols have moved 1% since the last scan on the scanner's ticker stream
+        self.scan_floor = 60
+        self.scan_ceiling = 300
+        self.move_threshold = 0.01
+        self.moved_symbols_trigger = 3
+        self._wake = threading.Event()
+        self._price_baseline = {}
+        self._moved_symbols = set()
+        self.signal_engine.scanner.add_ticker_listener(self._on_tickers)
+        self.status = StatusDict({
             'running': False,
             'start_time': None,
             'signals_sent': 0,
@@ -67,14 +156,68 @@ class EnhancedScalpBot:
             'current_scan': None,
             'last_scan_time': None,
             'market_count': 0
-        }
+        })
+        
+        # The test message only changes with its timestamp, so reuse it within the same second
+        self._test_message_for_second = functools.lru_cache(maxsize=1)(
+            lambda second: self.notifier.format_test_message())
+        self._timestamp_for_second = functools.lru_cache(maxsize=1)(
+            lambda second: datetime.fromtimestamp(second).strftime('%Y-%m-%d %H:%M:%S'))
         
         # Signal tracking
-        self.last_signals = []
+        self.last_signals = deque(maxlen=10)
+        # Bumped whenever last_signals changes, so /api/signals can reuse its last encoding
+        self._signals_rev = 0
         self.market_data = []
+        
+        # Telegram sends run on a dedicated event loop thread with one pooled aiohttp session
+        self._loop = None
+        self._loop_lock = threading.Lock()
+        self._aio_session = None
+        
+        # Formatted signals wait here for the sender worker; bounded so a stalled API can't grow memory
+        self._send_q = queue.Queue(maxsize=256)
+        self._sender_thread = None
+        
+        # Telegram allows ~30 msg/s overall and 1 msg/s per chat; pace sends instead of collecting 429s
+        self._global_bucket = TokenBucket(rate=25, capacity=30)
+        self._per_chat_buckets = defaultdict(lambda: TokenBucket(rate=1, capacity=1))
 
-    def send_telegram_message(self, message, chat_id=None):
-        """Send message to Telegram (KEEPING WORKING DELIVERY)"""
+    def _get_loop(self):
+        """Event loop for Telegram delivery, started on first use"""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="telegram-loop", daemon=True).start()
+            return self._loop
+
+    async def _get_aio_session(self):
+        """Shared keep-alive session; only touched from the delivery loop"""
+        if self._aio_session is None or self._aio_session.closed:
+            self._aio_session = aiohttp.ClientSession(
+                # Up to 16 pooled connections to api.telegram.org, DNS answer reused for 5 minutes
+                connector=aiohttp.TCPConnector(limit=32, limit_per_host=16, keepalive_timeout=75, ttl_dns_cache=300),
+                # Separate connect and read budgets so a slow read doesn't hide a failed connect;
+                # sendMessage answers in well under a second, so a stalled read is cut off after 10s
+                timeout=aiohttp.ClientTimeout(total=15, connect=3.05, sock_read=10)
+            )
+        return self._aio_session
+
+    async def _close_aio_session(self):
+        if self._aio_session is not None and not self._aio_session.closed:
+            await self._aio_session.close()
+        self._aio_session = None
+
+    def close(self):
+        """Close the pooled Telegram connections and stop the delivery loop"""
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            asyncio.run_coroutine_threadsafe(self._close_aio_session(), loop).result(timeout=5)
+            loop.call_soon_threadsafe(loop.stop)
+
+    async def _send_async(self, message, chat_id=None):
+        """Post one message to Telegram"""
         if not self.telegram_token:
             print("Telegram token not configured")
             return False
@@ -84,29 +227,89 @@ class EnhancedScalpBot:
             print("Telegram chat ID not configured")
             return False
 
-        # Check for test mode
-        if os.getenv('TEST_MODE') == 'true':
-            print(f"TEST MODE: Would send Telegram message: {message[:100]}...")
-            return True
-
         try:
             url = f"https://api.telegram.org/bot{self.telegram_token}/sendMessage"
-            data = {
+            payload = orjson.dumps({
                 'chat_id': target_chat,
                 'text': message,
                 'parse_mode': 'HTML'
-            }
-            response = requests.post(url, data=data, timeout=30)
-            return response.status_code == 200
-        except requests.exceptions.ConnectTimeout:
+            })
+            session = await self._get_aio_session()
+            attempts = 3
+            for attempt in range(attempts):
+                await self._global_bucket.acquire()
+                await self._per_chat_buckets[target_chat].acquire()
+                async with session.post(url, data=payload, headers={'Content-Type': 'application/json'}) as response:
+                    status = response.status
+                    if status == 429:
+                        # Rate limited: Telegram says how long to wait in the body, proxies in the header
+                        try:
+                            body = await response.json(content_type=None)
+                        except ValueError:
+                            body = {}
+                        delay = (body.get('parameters', {}).get('retry_after')
+                                 or response.headers.get('Retry-After')
+                                 or 0.5 * 2 ** attempt)
+                    else:
+                        # Only the status matters; drain the echoed message as raw bytes, never decoded,
+                        # so aiohttp hands the connection back to the pool instead of closing it
+                        await response.content.read()
+                        if status < 500:
+                            return status == 200
+                        delay = 0.5 * 2 ** attempt
+                if attempt == attempts - 1:
+                    break
+                # Jitter keeps concurrent sends that failed together from retrying in lockstep
+                delay = float(delay) + random.uniform(0, 0.25)
+                print(f"Telegram returned {status}, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            return False
+        except asyncio.TimeoutError:
             print("Telegram connection timeout (test-safe)")
             return False
         except Exception as e:
             print(f"Telegram error: {e}")
             return False
 
+    def send_telegram_messages(self, messages, chat_id=None):
+        """Send several messages concurrently; returns one success flag per message"""
+        if not messages:
+            return []
+        
+        # Test mode never touches the delivery loop
+        if self._test_mode:
+            for message in messages:
+                print(f"TEST MODE: Would send Telegram message: {message[:100]}...")
+            return [True] * len(messages)
+        
+        async def send_all():
+            return await asyncio.gather(*(self._send_async(message, chat_id) for message in messages))
+        
+        return asyncio.run_coroutine_threadsafe(send_all(), self._get_loop()).result()
+
+    def send_telegram_message(self, message, chat_id=None):
+        """Send message to Telegram (KEEPING WORKING DELIVERY)"""
+        return self.send_telegram_messages([message], chat_id)[0]
+
+    def scan_in_progress(self):
+        """Whether a market scan is currently running"""
+        return self._scan_lock.locked()
+
     def scan_and_generate_signals(self):
-        """Scan markets and generate signals"""
+        """Scan markets and generate signals; returns False if another scan was already running"""
+        if not self._scan_lock.acquire(blocking=False):
+            print("⏭ Scan already running, skipping")
+            return False
+        try:
+            self._scan()
+        finally:
+            self._scan_lock.release()
+        return True
+
+    def _scan(self):
+        # Movement is measured from here; the price stream fills in each symbol's first price
+        self._price_baseline = {}
+        self._moved_symbols = set()
         try:
             print("🔍 Starting market scan...")
             self.status['current_scan'] = "Scanning markets..."
@@ -121,65 +324,172 @@ class EnhancedScalpBot:
             if signals:
                 print(f"✅ Generated {len(signals)} signals")
                 
-                # Send each signal
+                # Hand formatted messages to the sender worker; the scan doesn't wait on Telegram
+                self._ensure_sender()
+                format_message = self.notifier.format_signal_message
+                enqueue = self._send_q.put_nowait
                 for signal in signals:
                     try:
-                        # Format signal message
-                        message = self.notifier.format_signal_message(signal)
-                        
-                        # Send to main channel
-                        if self.send_telegram_message(message):
-                            print(f"✅ Signal sent for {signal['symbol']}")
-                            self.status['signals_sent'] += 1
-                            self.status['last_signal'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                            
-                            # Store in recent signals
-                            self.last_signals.append(signal)
-                            if len(self.last_signals) > 10:
-                                self.last_signals.pop(0)
-                        else:
-                            print(f"❌ Failed to send signal for {signal['symbol']}")
-                    
+                        message = format_message(signal)
+                        enqueue((signal, message))
+                    except queue.Full:
+                        print(f"❌ Send queue full, dropping signal for {signal['symbol']}")
                     except Exception as e:
-                        print(f"❌ Error sending signal: {e}")
+                        print(f"❌ Error queueing signal: {e}")
                         continue
             else:
                 print("📊 No signals generated in this scan")
             
             # Update status
             self.status['current_scan'] = "Scan complete"
-            self.status['last_scan_time'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            self.status['last_scan_time'] = self._now_str()
             
         except Exception as e:
             print(f"❌ Error in scan_and_generate_signals: {e}")
             self.status['current_scan'] = f"Error: {str(e)}"
 
+    def test_message(self):
+        """Startup/test message, formatted at most once per second"""
+        return self._test_message_for_second(int(time.time()))
+
+    def _now_str(self):
+        """Current local time as 'YYYY-MM-DD HH:MM:SS', formatted once per second"""
+        return self._timestamp_for_second(int(time.time()))
+
+    def _ensure_sender(self):
+        """Start the sender worker if it isn't running"""
+        if self._sender_thread is None or not self._sender_thread.is_alive():
+            self._sender_thread = threading.Thread(target=self._sender_worker, name="signal-sender", daemon=True)
+            self._sender_thread.start()
+
+    def _coalesce(self, batch, limit=3800):
+        """Group (signal, message) pairs into combined messages under Telegram's 4096-char cap"""
+        # len() counts code points; the emoji in formatted signals count double against Telegram's cap
+        chunks = []
+        items, length = [], 0
+        for signal, message in batch:
+            if items and length + len(message) + 2 > limit:
+                chunks.append((items, '\n\n'.join(m for _, m in items)))
+                items, length = [], 0
+            items.append((signal, message))
+            length += len(message) + (2 if length else 0)
+        if items:
+            chunks.append((items, '\n\n'.join(m for _, m in items)))
+        return chunks
+
+    def _sender_worker(self):
+        """Send queued signals, batching whatever has accumulated since the last send"""
+        while True:
+            batch = [self._send_q.get()]
+            while True:
+                try:
+                    batch.append(self._send_q.get_nowait())
+                except queue.Empty:
+                    break
+            
+            try:
+                # Coalesce into as few messages as fit; if a combined message fails, retry its signals singly
+                chunks = self._coalesce(batch)
+                results = self.send_telegram_messages([text for _, text in chunks])
+                delivered = []
+                retry = []
+                for (items, _), sent in zip(chunks, results):
+                    if sent:
+                        delivered.extend((signal, True) for signal, _ in items)
+                    elif len(items) > 1:
+                        retry.extend(items)
+                    else:
+                        delivered.append((items[0][0], False))
+                if retry:
+                    singles = self.send_telegram_messages([message for _, message in retry])
+                    delivered.extend((signal, sent) for (signal, _), sent in zip(retry, singles))
+                
+                sent_count = 0
+                for signal, sent in delivered:
+                    # Sent to main channel
+                    if sent:
+                        print(f"✅ Signal sent for {signal['symbol']}")
+                        sent_count += 1
+                        
+                        # Store in recent signals; the deque drops the oldest past 10
+                        self.last_signals.append(signal)
+                    else:
+                        print(f"❌ Failed to send signal for {signal['symbol']}")
+                
+                # One status update per batch, so the cached status JSON and its stream listeners see a single change
+                if sent_count:
+                    self._signals_rev += 1
+                    self.status['signals_sent'] += sent_count
+                    self.status['last_signal'] = self._now_str()
+            except Exception as e:
+                print(f"❌ Error sending signals: {e}")
+            finally:
+                for _ in batch:
+                    self._send_q.task_done()
+
+    def _on_tickers(self, tickers):
+        """Scanner ticker-stream listener: wake the main loop once enough symbols have moved"""
+        # _scan swaps in fresh containers, so read them once per batch
+        baseline = self._price_baseline
+        moved = self._moved_symbols
+        for symbol, ticker in tickers.items():
+            price = ticker.get('last')
+            if not price:
+                continue
+            reference = baseline.setdefault(symbol, price)
+            if abs(price - reference) >= reference * self.move_threshold:
+                moved.add(symbol)
+        if len(moved) >= self.moved_symbols_trigger:
+            self._wake.set()
+
+    def _startup_due(self, marker_path="logs/last_startup", min_interval=3600):
+        """Whether the startup message should be sent; records the send time when it should"""
+        try:
+            if time.time() - os.path.getmtime(marker_path) < min_interval:
+                return False
+        except OSError:
+            pass  # No marker yet
+        
+        try:
+            os.makedirs(os.path.dirname(marker_path), exist_ok=True)
+            with open(marker_path, 'w') as f:
+                f.write(str(time.time()))
+        except OSError as e:
+            print(f"Error recording startup time: {e}")
+        return True
+
     def main_loop(self):
         """Main bot loop"""
         print("🚀 Enhanced ScalpBot starting...")
         self.running = True
         self.status['running'] = True
-        self.status['start_time'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.status['start_time'] = self._now_str()
+        
+        # Send startup message, unless one already went out within the hour (e.g. a crash-restart loop)
+        if self._startup_due():
+            startup_message = self.test_message()
+            self.send_telegram_message(startup_message)
         
-        # Send startup message
-        startup_message = self.notifier.format_test_message()
-        self.send_telegram_message(startup_message)
+        # Movement triggers come from the scanner's ticker stream, started here rather than on the first scan
+        self.signal_engine.scanner.start_ticker_stream()
         
         while self.running:
             try:
                 # Scan and generate signals
+                self._wake.clear()
                 self.scan_and_generate_signals()
                 
-                # Wait before next scan (5 minutes)
-                print("⏰ Waiting 5 minutes before next scan...")
-                for _ in range(300):  # 5 minutes
-                    if not self.running:
-                        break
-                    time.sleep(1)
+                # Wait out the floor, then until the price stream reports movement or the ceiling passes;
+                # stop() wakes both waits immediately
+                print("⏰ Waiting for market movement (1-5 minutes) before next scan...")
+                if self._stop_event.wait(timeout=self.scan_floor):
+                    break
+                self._wake.wait(timeout=self.scan_ceiling - self.scan_floor)
                 
             except Exception as e:
                 print(f"❌ Error in main loop: {e}")
-                time.sleep(60)  # Wait 1 minute on error
+                if self._stop_event.wait(timeout=60):  # Wait 1 minute on error
+                    break
         
         print("🛑 Bot stopped.")
 
@@ -187,6 +497,8 @@ class EnhancedScalpBot:
         """Start the bot"""
         if not self.running:
             print("🚀 Starting Enhanced ScalpBot...")
+            self._stop_event.clear()
+            self._ensure_sender()
             
             # Start main loop in background thread
             thread = threading.Thread(target=self.main_loop)
@@ -198,29 +510,136 @@ class EnhancedScalpBot:
         print("🛑 Stopping Enhanced ScalpBot...")
         self.running = False
         self.status['running'] = False
+        self._stop_event.set()
+        self._wake.set()
+
+# One bot per process, built on first use; `python final_bot.py` hands off to gunicorn before anything is built
+_bot = None
+_bot_lock = threading.Lock()
+
+def get_bot() -> EnhancedScalpBot:
+    """The process-wide bot instance, created on first call"""
+    global _bot
+    if _bot is None:
+        with _bot_lock:
+            if _bot is None:
+                _bot = EnhancedScalpBot()
+                atexit.register(_bot.close)
+                _bot.signal_engine.warmup()
+    return _bot
+
+def ttl_cache(seconds):
+    """Memoize a no-argument helper for `seconds`; errors propagate and are not cached"""
+    def decorator(func):
+        lock = threading.Lock()
+        entry = {}
+        
+        @functools.wraps(func)
+        def wrapper():
+            with lock:
+                if entry and entry['expires'] > time.monotonic():
+                    return entry['value']
+                value = func()
+                entry['expires'] = time.monotonic() + seconds
+                entry['value'] = value
+                return value
+        return wrapper
+    return decorator
+
+# Dashboard polls re-ask for the same numbers every few seconds; serve them from a short-lived cache
+@ttl_cache(seconds=30)
+def _signal_statistics():
+    bot = get_bot()
+    return bot.logger.get_signal_statistics()
+
+@ttl_cache(seconds=5)
+def _portfolio_summary():
+    bot = get_bot()
+    return bot.signal_engine.risk_manager.get_portfolio_summary()
+
+@ttl_cache(seconds=60)
+def _regime_summary():
+    bot = get_bot()
+    markets = bot.signal_engine.scanner.get_top_markets(limit=10)
+    return bot.signal_engine.market_regime_detector.get_regime_summary(markets)
+
+_SENTIMENT_SYMBOLS = ('BTC/USDT', 'ETH/USDT', 'BNB/USDT', 'ADA/USDT', 'SOL/USDT')
+
+@ttl_cache(seconds=60)
+def _sentiment_body():
+    # The summary scrapes RSS feeds; concurrent requests wait on the cache lock and share one result
+    bot = get_bot()
+    sentiment_summary = bot.signal_engine.sentiment_analyzer.get_market_sentiment_summary(list(_SENTIMENT_SYMBOLS))
+    return app.json.dumps({'sentiment_summary': sentiment_summary, 'success': True}).encode()
 
-# Create bot instance
-bot = EnhancedScalpBot()
+@functools.lru_cache(maxsize=1)
+def _dashboard_html():
+    """dashboard.html has no template variables (the page loads everything over the API), so render it once.
+
+    Returns (plain, gzipped) bytes.
+    """
+    html = render_template('dashboard.html').encode()
+    return html, gzip.compress(html, compresslevel=9)
 
 # Flask routes
 @app.route('/')
 def home():
-    return render_template('dashboard.html', bot_status=bot.status)
+    html, compressed = _dashboard_html()
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = Response(compressed, mimetype='text/html')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(html, mimetype='text/html')
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+# Health probes hit this every few seconds and there are only two possible bodies; encode them once
+_HEALTH_BODIES = {
+    running: orjson.dumps({'status': 'enhanced_scalbot_ready', 'bot_running': running, 'version': '2.0.0'})
+    for running in (False, True)
+}
 
 @app.route('/health')
 def health():
-    return jsonify({
-        'status': 'enhanced_scalbot_ready',
-        'bot_running': bot.status['running'],
-        'version': '2.0.0'
-    })
+    bot = get_bot()
+    return Response(_HEALTH_BODIES[bool(bot.status['running'])], mimetype='application/json')
 
 @app.route('/api/status')
 def api_status():
-    return jsonify(bot.status)
+    bot = get_bot()
+    return Response(bot.status.to_json(), mimetype='application/json')
+
+# Each open stream holds a gunicorn thread, so cap them and end each one periodically;
+# EventSource reconnects on its own, and the dashboard falls back to polling when turned away
+_status_streams = threading.BoundedSemaphore(4)
+
+@app.route('/api/status/stream')
+def api_status_stream():
+    """Push status as server-sent events whenever it changes"""
+    if not _status_streams.acquire(blocking=False):
+        return jsonify({'error': 'Too many status streams'}), 503
+    bot = get_bot()
+    
+    def events():
+        deadline = time.monotonic() + 300
+        while True:
+            version = bot.status.version
+            yield b'data: ' + bot.status.to_json() + b'\n\n'
+            while not bot.status.wait_for_change(version, timeout=25):
+                if time.monotonic() > deadline:
+                    return
+                yield b': keep-alive\n\n'
+            if time.monotonic() > deadline:
+                return
+    
+    response = Response(events(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+    # Released when the server closes the response, even if the client left before the first event
+    response.call_on_close(_status_streams.release)
+    return response
 
 @app.route('/api/start')
 def api_start():
+    bot = get_bot()
     if not bot.running:
         bot.start()
         return jsonify({'status': 'Bot starting', 'running': True})
@@ -228,6 +647,7 @@ def api_start():
 
 @app.route('/api/stop')
 def api_stop():
+    bot = get_bot()
     if bot.running:
         bot.stop()
         return jsonify({'status': 'Bot stopping', 'running': False})
@@ -237,7 +657,8 @@ def api_stop():
 def test_signal():
     """Send a test signal"""
     try:
-        test_message = bot.notifier.format_test_message()
+        bot = get_bot()
+        test_message = bot.test_message()
         success = bot.send_telegram_message(test_message)
         
         return jsonify({
@@ -250,14 +671,22 @@ def test_signal():
             'message': f'Error: {str(e)}'
         })
 
+# (revision, encoded body) of the last /api/signals response
+_signals_body = [-1, b'']
+
 @app.route('/api/signals')
 def api_signals():
     """Get recent signals"""
     try:
-        return jsonify({
-            'signals': bot.last_signals,
-            'count': len(bot.last_signals)
-        })
+        bot = get_bot()
+        rev, body = _signals_body
+        if rev != bot._signals_rev:
+            # Read the revision first; a concurrent append leaves this encoding a revision behind
+            rev = bot._signals_rev
+            signals = list(bot.last_signals)
+            body = app.json.dumps({'signals': signals, 'count': len(signals)}).encode()
+            _signals_body[:] = (rev, body)
+        return Response(body, mimetype='application/json')
     except Exception as e:
         return jsonify({
             'signals': [],
@@ -265,17 +694,20 @@ def api_signals():
             'error': str(e)
         })
 
+@ttl_cache(seconds=5)
+def _statistics_body():
+    # Copy, so adding the portfolio doesn't touch the cached statistics
+    stats = dict(_signal_statistics())
+    
+    # Add portfolio monitoring data
+    stats['portfolio'] = _portfolio_summary()
+    return app.json.dumps(stats).encode()
+
 @app.route('/api/statistics')
 def api_statistics():
     """Get signal statistics and portfolio data"""
     try:
-        stats = bot.logger.get_signal_statistics()
-        
-        # Add portfolio monitoring data
-        portfolio_summary = bot.signal_engine.risk_manager.get_portfolio_summary()
-        stats['portfolio'] = portfolio_summary
-        
-        return jsonify(stats)
+        return Response(_statistics_body(), mimetype='application/json')
     except Exception as e:
         return jsonify({
             'error': str(e),
@@ -290,6 +722,12 @@ def api_statistics():
 def api_scan_now():
     """Trigger immediate market scan"""
     try:
+        bot = get_bot()
+        if bot.scan_in_progress():
+            return jsonify({
+                'success': False,
+                'message': 'Scan already running'
+            }), 409
         if bot.running:
             # Start scan in background
             thread = threading.Thread(target=bot.scan_and_generate_signals)
@@ -315,8 +753,9 @@ def api_scan_now():
 def api_portfolio():
     """Get portfolio monitoring data"""
     try:
-        portfolio_data = bot.signal_engine.risk_manager.get_portfolio_summary()
-        active_trades = bot.signal_engine.risk_manager.active_trades
+        bot = get_bot()
+        portfolio_data = _portfolio_summary()
+        active_trades = bot.signal_engine.risk_manager.get_active_trades()
         
         return jsonify({
             'portfolio': portfolio_data,
@@ -335,9 +774,8 @@ def api_portfolio():
 def api_market_regime():
     """Get market regime analysis"""
     try:
-        # Get recent market data for analysis
-        markets = bot.signal_engine.scanner.get_top_markets(limit=10)
-        regime_summary = bot.signal_engine.market_regime_detector.get_regime_summary(markets)
+        # Regime over the top 10 markets
+        regime_summary = _regime_summary()
         
         return jsonify({
             'regime_summary': regime_summary,
@@ -354,14 +792,8 @@ def api_market_regime():
 def api_sentiment():
     """Get market sentiment analysis"""
     try:
-        # Get top symbols for sentiment analysis
-        symbols = ['BTC/USDT', 'ETH/USDT', 'BNB/USDT', 'ADA/USDT', 'SOL/USDT']
-        sentiment_summary = bot.signal_engine.sentiment_analyzer.get_market_sentiment_summary(symbols)
-        
-        return jsonify({
-            'sentiment_summary': sentiment_summary,
-            'success': True
-        })
+        # Sentiment over the top symbols
+        return Response(_sentiment_body(), mimetype='application/json')
     except Exception as e:
         return jsonify({
             'success': False,
@@ -378,4 +810,15 @@ if __name__ == '__main__':
     print(f"📊 Multi-strategy system (Trap, SMC, Scalping)")
     print(f"✅ Telegram delivery system ready")
     
-    app.run(host='0.0.0.0', port=port, debug=False) 
\ No newline at end of file
+    # Serve through gunicorn (one worker so there is one bot, threads for concurrent API calls);
+    # the gthread worker parks idle keep-alive connections in its poller, so polling dashboards
+    # don't each pin a thread. TEST_MODE or FLASK_DEV keeps the single-process dev server
+    if os.getenv('TEST_MODE') != 'true' and not os.getenv('FLASK_DEV'):
+        try:
+            os.execvp("gunicorn", ["gunicorn", "-k", "gthread", "-w", "1", "--threads", "8",
+                                   "--worker-connections", "1000", "--keep-alive", "30",
+                                   "-b", f"0.0.0.0:{port}", "final_bot:app"])
+        except OSError as e:
+            print(f"⚠ gunicorn unavailable ({e}), falling back to the Flask server")
+    
+    app.run(host='0.0.0.0', port=port, debug=False, threaded=True) 
\ No newline at end of file
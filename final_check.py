@@ -7,28 +7,26 @@ Performs a comprehensive check to ensure the deployment package is ready
 import os
 import sys
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 def calculate_checksum(file_path):
-    """Calculate MD5 checksum of a file"""
-    hash_md5 = hashlib.md5()
+    """Calculate BLAKE2b checksum of a file"""
     try:
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+            # Python 3.11+ hashes the whole file in C; older runtimes read 1 MiB chunks
+            if hasattr(hashlib, "file_digest"):
+                return hashlib.file_digest(f, "blake2b").hexdigest()
+            digest = hashlib.blake2b()
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+            return digest.hexdigest()
     except Exception as e:
         return f"Error: {e}"
 
-def verify_deployment_package():
-    """Verify the deployment package is complete and ready"""
-    print("🚀 FINAL DEPLOYMENT VERIFICATION")
-    print("=" * 50)
-    print(f"Verification Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print()
-    
-    # Check required files
-    required_files = [
+# Files that must be present, checksummed and reported per group: (heading, directory, names, missing label)
+FILE_CHECKS = [
+    ("📁 Checking required files...", '.', [
         'final_bot.py',
         'requirements.txt',
         'Procfile',
@@ -40,47 +38,19 @@ def verify_deployment_package():
         'setup.sh',
         'start.sh',
         'VERSION'
-    ]
-    
-    print("📁 Checking required files...")
-    missing_files = []
-    for file in required_files:
-        if os.path.exists(file):
-            checksum = calculate_checksum(file)
-            print(f"  ✅ {file} - {checksum[:8]}...")
-        else:
-            print(f"  ❌ {file} - MISSING")
-            missing_files.append(file)
-    
-    if missing_files:
-        print(f"\n❌ Missing files: {', '.join(missing_files)}")
-        return False
-    
-    # Check required directories
-    required_dirs = ['core', 'templates']
-    print("\n📂 Checking required directories...")
-    missing_dirs = []
-    for directory in required_dirs:
-        if os.path.exists(directory) and os.path.isdir(directory):
-            # Count files in directory
-            file_count = len([f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f))])
-            print(f"  ✅ {directory}/ ({file_count} files)")
-        else:
-            print(f"  ❌ {directory}/ - MISSING")
-            missing_dirs.append(directory)
-    
-    if missing_dirs:
-        print(f"\n❌ Missing directories: {', '.join(missing_dirs)}")
-        return False
-    
-    # Check core modules
-    core_modules = [
+    ], "files"),
+    ("\n🔧 Checking core modules...", 'core', [
+        '_ranking.py',
+        '_scalp_core.py',
         'dark_pool.py',
         'indicators.py',
+        'jit.py',
         'liquidation.py',
         'logger.py',
+        'market_bundle.py',
         'market_regime.py',
         'notifier.py',
+        'rate_limiter.py',
         'risk.py',
         'scanner.py',
         'sentiment.py',
@@ -88,40 +58,81 @@ def verify_deployment_package():
         'strategy_scalp.py',
         'strategy_smc.py',
         'strategy_trap.py'
-    ]
-    
-    print("\n🔧 Checking core modules...")
-    missing_modules = []
-    for module in core_modules:
-        module_path = os.path.join('core', module)
-        if os.path.exists(module_path):
-            checksum = calculate_checksum(module_path)
-            print(f"  ✅ {module} - {checksum[:8]}...")
+    ], "core modules"),
+    ("\n🎨 Checking templates...", 'templates', ['dashboard.html'], "templates"),
+]
+
+def list_files(directory):
+    """Names of the regular files in `directory`; empty if it doesn't exist"""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries if entry.is_file()}
+    except OSError:
+        return set()
+
+def calculate_checksums(checks):
+    """Checksum every present file in `checks` on one thread pool, keyed by (directory, name)"""
+    # One listing per directory answers every existence check; hashlib releases the GIL while hashing
+    present = {directory: list_files(directory) for _, directory, _, _ in checks}
+    keys = [(directory, name) for _, directory, names, _ in checks for name in names if name in present[directory]]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        return dict(zip(keys, executor.map(lambda key: calculate_checksum(os.path.join(*key)), keys)))
+
+def report_file_group(heading, directory, names, label, checksums):
+    """Print one file group's checksums; False if any of its files is missing"""
+    print(heading)
+    missing = []
+    for name in names:
+        checksum = checksums.get((directory, name))
+        if checksum is not None:
+            print(f"  ✅ {name} - {checksum[:8]}...")
         else:
-            print(f"  ❌ {module} - MISSING")
-            missing_modules.append(module)
+            print(f"  ❌ {name} - MISSING")
+            missing.append(name)
     
-    if missing_modules:
-        print(f"\n❌ Missing core modules: {', '.join(missing_modules)}")
+    if missing:
+        print(f"\n❌ Missing {label}: {', '.join(missing)}")
         return False
+    return True
+
+def verify_deployment_package():
+    """Verify the deployment package is complete and ready"""
+    print("🚀 FINAL DEPLOYMENT VERIFICATION")
+    print("=" * 50)
+    print(f"Verification Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
     
-    # Check templates
-    template_files = ['dashboard.html']
-    print("\n🎨 Checking templates...")
-    missing_templates = []
-    for template in template_files:
-        template_path = os.path.join('templates', template)
-        if os.path.exists(template_path):
-            checksum = calculate_checksum(template_path)
-            print(f"  ✅ {template} - {checksum[:8]}...")
+    # Every file group is hashed up front in one pass; the report below keeps its section order
+    checksums = calculate_checksums(FILE_CHECKS)
+    required_files_check, *other_file_checks = FILE_CHECKS
+    
+    # Check required files
+    if not report_file_group(*required_files_check, checksums):
+        return False
+    
+    # Check required directories
+    required_dirs = ['core', 'templates']
+    print("\n📂 Checking required directories...")
+    missing_dirs = []
+    for directory in required_dirs:
+        if os.path.exists(directory) and os.path.isdir(directory):
+            # Count files in directory
+            with os.scandir(directory) as entries:
+                file_count = sum(1 for entry in entries if entry.is_file())
+            print(f"  ✅ {directory}/ ({file_count} files)")
         else:
-            print(f"  ❌ {template} - MISSING")
-            missing_templates.append(template)
+            print(f"  ❌ {directory}/ - MISSING")
+            missing_dirs.append(directory)
     
-    if missing_templates:
-        print(f"\n❌ Missing templates: {', '.join(missing_templates)}")
+    if missing_dirs:
+        print(f"\n❌ Missing directories: {', '.join(missing_dirs)}")
         return False
     
+    # Check core modules and templates
+    for check in other_file_checks:
+        if not report_file_group(*check, checksums):
+            return False
+    
     # Check deployment scripts are executable
     executable_scripts = ['setup.sh', 'start.sh']
     print("\n⚙️  Checking executable scripts...")
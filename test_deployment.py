@@ -6,73 +6,27 @@ Tests that all required components are present and working correctly
 
 import sys
 import os
-import importlib
+import importlib.util
+
+# Third-party packages the bot needs at runtime
+REQUIRED_PACKAGES = ('ccxt', 'requests', 'feedparser', 'vaderSentiment', 'flask', 'dotenv', 'pandas', 'numpy',
+                     'aiohttp', 'orjson')
 
 def test_imports():
-    """Test all required imports"""
+    """Test all required packages are installed"""
     print("🔍 Testing imports...")
     
-    # Core dependencies
-    try:
-        import ccxt
-        print("✅ ccxt")
-    except ImportError as e:
-        print(f"❌ ccxt: {e}")
-        return False
-    
-    try:
-        import requests
-        print("✅ requests")
-    except ImportError as e:
-        print(f"❌ requests: {e}")
-        return False
-    
-    try:
-        import feedparser
-        print("✅ feedparser")
-    except ImportError as e:
-        print(f"❌ feedparser: {e}")
-        return False
-    
-    try:
-        import textblob
-        print("✅ textblob")
-    except ImportError as e:
-        print(f"❌ textblob: {e}")
-        return False
-    
-    try:
-        import flask
-        print("✅ flask")
-    except ImportError as e:
-        print(f"❌ flask: {e}")
-        return False
-    
-    try:
-        import dotenv
-        print("✅ dotenv")
-    except ImportError as e:
-        print(f"❌ dotenv: {e}")
-        return False
-    
-    try:
-        import pandas
-        print("✅ pandas")
-    except ImportError as e:
-        print(f"❌ pandas: {e}")
-        return False
-    
-    try:
-        import numpy
-        print("✅ numpy")
-    except ImportError as e:
-        print(f"❌ numpy: {e}")
-        return False
+    # Spec lookup finds the package without running it, so ccxt/pandas don't load just to be checked
+    for package in REQUIRED_PACKAGES:
+        if importlib.util.find_spec(package) is None:
+            print(f"❌ {package}: not installed")
+            return False
+        print(f"✅ {package}")
     
     return True
 
 def test_core_modules():
-    """Test core module imports"""
+    """Test core modules can be found"""
     print("\n🔍 Testing core modules...")
     
     core_modules = [
@@ -93,7 +47,9 @@ def test_core_modules():
     
     for module in core_modules:
         try:
-            importlib.import_module(module)
+            # Locating the spec doesn't execute the module, so pandas/ccxt aren't loaded here
+            if importlib.util.find_spec(module) is None:
+                raise ImportError("module not found")
             print(f"✅ {module}")
         except ImportError as e:
             print(f"❌ {module}: {e}")
@@ -101,6 +57,20 @@ def test_core_modules():
     
     return True
 
+def _scan_dir(directory):
+    """(files, subdirectories) of `directory` from a single scandir; both empty if it is missing"""
+    files, dirs = set(), set()
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    dirs.add(entry.name)
+                elif entry.is_file():
+                    files.add(entry.name)
+    except OSError:
+        pass
+    return frozenset(files), frozenset(dirs)
+
 def test_file_structure():
     """Test that all required files are present"""
     print("\n🔍 Testing file structure...")
@@ -123,15 +93,18 @@ def test_file_structure():
         'templates'
     ]
     
+    # One directory listing per folder instead of a stat call per expected file
+    root_files, root_dirs = _scan_dir('.')
+    
     for file in required_files:
-        if os.path.exists(file):
+        if file in root_files:
             print(f"✅ {file}")
         else:
             print(f"❌ {file} not found")
             return False
     
     for directory in required_dirs:
-        if os.path.exists(directory) and os.path.isdir(directory):
+        if directory in root_dirs:
             print(f"✅ {directory}/")
         else:
             print(f"❌ {directory}/ not found")
@@ -139,12 +112,17 @@ def test_file_structure():
     
     # Check core modules
     core_modules = [
+        '_ranking.py',
+        '_scalp_core.py',
         'dark_pool.py',
         'indicators.py',
+        'jit.py',
         'liquidation.py',
         'logger.py',
+        'market_bundle.py',
         'market_regime.py',
         'notifier.py',
+        'rate_limiter.py',
         'risk.py',
         'scanner.py',
         'sentiment.py',
@@ -154,9 +132,10 @@ def test_file_structure():
         'strategy_trap.py'
     ]
     
+    core_files = _scan_dir('core')[0]
     for module in core_modules:
         module_path = os.path.join('core', module)
-        if os.path.exists(module_path):
+        if module in core_files:
             print(f"✅ {module_path}")
         else:
             print(f"❌ {module_path} not found")
@@ -167,9 +146,10 @@ def test_file_structure():
         'dashboard.html'
     ]
     
+    template_dir_files = _scan_dir('templates')[0]
     for template in template_files:
         template_path = os.path.join('templates', template)
-        if os.path.exists(template_path):
+        if template in template_dir_files:
             print(f"✅ {template_path}")
         else:
             print(f"❌ {template_path} not found")
@@ -199,6 +179,37 @@ def test_environment():
     
     return True
 
+def test_keyword_backends():
+    """Test the keyword scan counts the same with and without pyahocorasick"""
+    print("\n🔍 Testing keyword scan backends...")
+    
+    from core.sentiment import SentimentAnalyzer
+    
+    # An empty cache path skips loading the persisted batch
+    automaton = SentimentAnalyzer(cache_file_path='')
+    if automaton._keyword_automaton is None:
+        print("⚠️  pyahocorasick not installed, only the fallback scan is available")
+        return True
+    fallback = SentimentAnalyzer(cache_file_path='')
+    fallback._keyword_automaton = None
+    
+    texts = [
+        "Bitcoin bullish breakout as BTC rallies; ether and ethereum follow",
+        "Solution providers warn of a sell-off: bearish crash, then panic selling",
+        "binance coin (bnb) burn lifts bulls; xbt/usd and sol pump",
+        "doge-coin dogecoin solana polygon polkadot chainlink ltc",
+        "no keywords here"
+    ]
+    for text in texts:
+        expected = automaton._scan_text(text.lower())
+        actual = fallback._scan_text(text.lower())
+        if actual != expected:
+            print(f"❌ {text!r}: automaton {expected}, fallback {actual}")
+            return False
+        print(f"✅ {text[:40]!r}")
+    
+    return True
+
 def main():
     """Run all deployment tests"""
     print("🚀 SCALPBOT DEPLOYMENT VERIFICATION")
@@ -208,7 +219,8 @@ def main():
         ("File Structure", test_file_structure),
         ("Environment Configuration", test_environment),
         ("Imports", test_imports),
-        ("Core Modules", test_core_modules)
+        ("Core Modules", test_core_modules),
+        ("Keyword Scan Backends", test_keyword_backends)
     ]
     
     passed = 0